@@ -0,0 +1,312 @@
+#!/usr/bin/env node
+
+const fs = require("node:fs");
+const os = require("node:os");
+const path = require("node:path");
+const { spawnSync } = require("node:child_process");
+
+const { createRenderer, packagedLayout, renderBar, renderDonut } = require("..");
+const { parseArgs: parseCliArgs } = require("../lib/cli");
+
+const ROOT_DIR = path.resolve(__dirname, "..");
+const CLI = path.join(ROOT_DIR, "bin", "cellgauge.js");
+const SHOWCASE = path.join(ROOT_DIR, "examples", "showcase.js");
+
+const WIDTHS = [1, 2, 4, 8, 16, 32, 64, 128, 256, 500];
+const STYLE_SWEEP_WIDTH = 8;
+const DEFAULT_TIME_MS = 300;
+const DEFAULT_WARMUP_MS = 100;
+const DEFAULT_CLI_RUNS = 20;
+const DEFAULT_THRESHOLD = 0.15;
+// Shortest timed sample; fast ops are batched up to this so timer overhead
+// stays in the noise.
+const MIN_SAMPLE_NS = 20_000;
+
+// The invocations examples/showcase.js demonstrates, as CLI argv.
+const CLI_INVOCATIONS = [
+  ["bar1 h+border", ["13", "--border"]],
+  ["bar1 full+border", ["44", "--full", "--border"]],
+  ["bar2 gapped h+border", ["41", "79", "--gapped", "--border"]],
+  ["bar3 gapped full", ["73", "39", "55", "--gapped", "--full"]],
+  ["donut full+border", ["67", "--donut", "--full", "--border"]],
+  ["format", ["--format", "cpu {bar:10:nhb:$1} bat {donut:fb:$2}", "42", "80"]],
+];
+
+// Inputs are cycled so no case renders the same state every iteration.
+const PCTS = Array.from({ length: 64 }, (_, i) => (i * 37) % 101);
+const LANE_VALUES = [1, 2, 3].map((lanes) =>
+  PCTS.map((_, i) => Array.from({ length: lanes }, (_, lane) => PCTS[(i + lane * 21) % PCTS.length])),
+);
+
+let sink = 0;
+
+function fail(message) {
+  process.stderr.write(`bench: ${message}\n`);
+  process.exit(1);
+}
+
+function usage() {
+  return `\
+usage: node bench/run.js [options]
+
+options:
+  --filter REGEX    run only cases whose name matches
+  --time MS         timed duration per in-process case (default ${DEFAULT_TIME_MS})
+  --warmup MS       untimed warmup per in-process case (default ${DEFAULT_WARMUP_MS})
+  --cli-runs N      process launches per CLI case (default ${DEFAULT_CLI_RUNS})
+  --no-cli          skip the CLI cold-start cases
+  --json FILE       write the results as JSON
+  --compare FILE    compare against results saved with --json
+  --threshold PCT   mean slowdown reported as a regression (default ${DEFAULT_THRESHOLD * 100})`;
+}
+
+function parseArgs(argv) {
+  const out = {
+    filter: null,
+    timeMs: DEFAULT_TIME_MS,
+    warmupMs: DEFAULT_WARMUP_MS,
+    cliRuns: DEFAULT_CLI_RUNS,
+    cli: true,
+    json: null,
+    compare: null,
+    threshold: DEFAULT_THRESHOLD,
+  };
+  const valueOptions = {
+    "--filter": (v) => (out.filter = new RegExp(v)),
+    "--time": (v) => (out.timeMs = positiveNumber("--time", v)),
+    "--warmup": (v) => (out.warmupMs = positiveNumber("--warmup", v)),
+    "--cli-runs": (v) => (out.cliRuns = positiveNumber("--cli-runs", v)),
+    "--json": (v) => (out.json = v),
+    "--compare": (v) => (out.compare = v),
+    "--threshold": (v) => (out.threshold = positiveNumber("--threshold", v) / 100),
+  };
+
+  for (let i = 0; i < argv.length; i += 1) {
+    const a = argv[i];
+    if (a === "--help" || a === "-h") {
+      process.stdout.write(`${usage()}\n`);
+      process.exit(0);
+    }
+    if (a === "--no-cli") {
+      out.cli = false;
+      continue;
+    }
+    const eq = a.indexOf("=");
+    const name = eq === -1 ? a : a.slice(0, eq);
+    if (valueOptions[name]) {
+      if (eq === -1 && i + 1 >= argv.length) fail(`${name} needs a value`);
+      valueOptions[name](eq === -1 ? argv[(i += 1)] : a.slice(eq + 1));
+      continue;
+    }
+    fail(`unknown option: ${a}`);
+  }
+  return out;
+}
+
+function positiveNumber(name, value) {
+  const n = Number(value);
+  if (!Number.isFinite(n) || n <= 0) fail(`${name} must be a positive number`);
+  return n;
+}
+
+function now() {
+  return Number(process.hrtime.bigint());
+}
+
+function percentile(sorted, p) {
+  return sorted[Math.min(sorted.length - 1, Math.max(0, Math.ceil(p * sorted.length) - 1))];
+}
+
+function summarize(samples, ops, elapsedNs) {
+  const sorted = Float64Array.from(samples).sort();
+  return {
+    ops,
+    samples: sorted.length,
+    opsPerSec: ops / (elapsedNs / 1e9),
+    meanNs: elapsedNs / ops,
+    p50Ns: percentile(sorted, 0.5),
+    p90Ns: percentile(sorted, 0.9),
+    p99Ns: percentile(sorted, 0.99),
+    maxNs: sorted[sorted.length - 1],
+  };
+}
+
+// Times fn(i) for timeMs after warmupMs of untimed calls.  Each sample is
+// the mean op time of one batch, so percentiles are over batches of at
+// least MIN_SAMPLE_NS rather than single sub-microsecond calls.
+function measure(fn, timeMs, warmupMs) {
+  let batch = 1;
+  let i = 0;
+  for (;;) {
+    const start = now();
+    for (let n = 0; n < batch; n += 1) sink += fn(i++).length;
+    if (now() - start >= MIN_SAMPLE_NS || batch >= 1 << 20) break;
+    batch *= 2;
+  }
+
+  const warmupEnd = now() + warmupMs * 1e6;
+  while (now() < warmupEnd) {
+    for (let n = 0; n < batch; n += 1) sink += fn(i++).length;
+  }
+
+  const samples = [];
+  let ops = 0;
+  let elapsed = 0;
+  while (elapsed < timeMs * 1e6) {
+    const start = now();
+    for (let n = 0; n < batch; n += 1) sink += fn(i++).length;
+    const dt = now() - start;
+    samples.push(dt / batch);
+    ops += batch;
+    elapsed += dt;
+  }
+  return summarize(samples, ops, elapsed);
+}
+
+function measureProcess(args, runs) {
+  const launch = () => {
+    const result = spawnSync(process.execPath, args, { stdio: ["ignore", "ignore", "pipe"] });
+    if (result.status !== 0) fail(`${args.join(" ")} exited ${result.status}: ${result.stderr}`);
+  };
+  launch(); // warm the file cache
+  const samples = [];
+  let elapsed = 0;
+  for (let n = 0; n < runs; n += 1) {
+    const start = now();
+    launch();
+    const dt = now() - start;
+    samples.push(dt);
+    elapsed += dt;
+  }
+  return summarize(samples, runs, elapsed);
+}
+
+function renderCases() {
+  const cases = [];
+  const add = (group, name, fn) => cases.push({ group, name, fn });
+  const families = packagedLayout().families;
+
+  // Width sweep: per-call renderBar (resolves the layout every call) against
+  // a prepared renderer, which is what long-running status bars use.
+  for (const lanes of [1, 2, 3]) {
+    const values = LANE_VALUES[lanes - 1];
+    for (const width of WIDTHS) {
+      const renderer = createRenderer({ lanes, width, border: true });
+      add("width", `renderBar bar${lanes} ${renderer.style} w=${width}`, (i) =>
+        renderBar(values[i & 63], width, renderer.style),
+      );
+      add("width", `renderer bar${lanes} ${renderer.style} w=${width}`, (i) => renderer.render(values[i & 63]));
+    }
+  }
+
+  // Style sweep at a typical width.
+  for (const lanes of [1, 2, 3]) {
+    const values = LANE_VALUES[lanes - 1];
+    for (const style of families[`bar${lanes}`].styles) {
+      add("style", `renderBar bar${lanes} ${style} w=${STYLE_SWEEP_WIDTH}`, (i) =>
+        renderBar(values[i & 63], STYLE_SWEEP_WIDTH, style),
+      );
+    }
+  }
+  for (const style of families.donut2.styles) {
+    add("style", `renderDonut ${style}`, (i) => renderDonut(PCTS[i & 63], style));
+  }
+
+  for (const [label, argv] of CLI_INVOCATIONS) {
+    add("parseArgs", `parseArgs ${label}`, () => Object.keys(parseCliArgs(argv)));
+  }
+  return cases;
+}
+
+function cliCases() {
+  const cases = [{ group: "cli", name: "node startup", args: ["-e", ""] }];
+  for (const [label, argv] of CLI_INVOCATIONS) {
+    cases.push({ group: "cli", name: `cli ${label}`, args: [CLI, ...argv] });
+  }
+  cases.push({ group: "cli", name: "showcase", args: [SHOWCASE] });
+  return cases;
+}
+
+function formatTime(ns) {
+  if (ns >= 1e6) return `${(ns / 1e6).toFixed(2)} ms`;
+  if (ns >= 1e3) return `${(ns / 1e3).toFixed(2)} us`;
+  return `${ns.toFixed(0)} ns`;
+}
+
+function formatRow(name, r) {
+  return (
+    `${name.padEnd(34)} ${Math.round(r.opsPerSec).toLocaleString("en-US").padStart(13)}` +
+    ` ${formatTime(r.p50Ns).padStart(10)} ${formatTime(r.p90Ns).padStart(10)} ${formatTime(r.p99Ns).padStart(10)}`
+  );
+}
+
+function header() {
+  return `${"case".padEnd(34)} ${"ops/sec".padStart(13)} ${"p50".padStart(10)} ${"p90".padStart(10)} ${"p99".padStart(10)}`;
+}
+
+function compare(baseline, results, threshold) {
+  let regressions = 0;
+  process.stdout.write(`\n${"case".padEnd(34)} ${"baseline".padStart(10)} ${"current".padStart(10)} ${"change".padStart(8)}\n`);
+  for (const [name, r] of Object.entries(results)) {
+    const old = baseline.results[name];
+    if (!old) continue;
+    const change = r.meanNs / old.meanNs - 1;
+    const regressed = change > threshold;
+    if (regressed) regressions += 1;
+    process.stdout.write(
+      `${name.padEnd(34)} ${formatTime(old.meanNs).padStart(10)} ${formatTime(r.meanNs).padStart(10)}` +
+        ` ${`${change >= 0 ? "+" : ""}${(change * 100).toFixed(1)}%`.padStart(8)}${regressed ? "  REGRESSION" : ""}\n`,
+    );
+  }
+  const missing = Object.keys(baseline.results).filter((name) => !(name in results));
+  if (missing.length > 0) process.stdout.write(`${missing.length} baseline cases not run\n`);
+  return regressions;
+}
+
+function main() {
+  const args = parseArgs(process.argv.slice(2));
+  const selected = (c) => !args.filter || args.filter.test(c.name);
+  const results = {};
+
+  let group = null;
+  const report = (c, r) => {
+    if (c.group !== group) {
+      group = c.group;
+      process.stdout.write(`\n[${group}]\n${header()}\n`);
+    }
+    process.stdout.write(`${formatRow(c.name, r)}\n`);
+    results[c.name] = { group: c.group, ...r };
+  };
+
+  for (const c of renderCases().filter(selected)) report(c, measure(c.fn, args.timeMs, args.warmupMs));
+  if (args.cli) {
+    for (const c of cliCases().filter(selected)) report(c, measureProcess(c.args, args.cliRuns));
+  }
+  if (Object.keys(results).length === 0) fail("no cases matched");
+
+  const output = {
+    node: process.version,
+    platform: `${process.platform}-${process.arch}`,
+    cpu: os.cpus()[0]?.model ?? "unknown",
+    timeMs: args.timeMs,
+    warmupMs: args.warmupMs,
+    cliRuns: args.cliRuns,
+    results,
+  };
+  if (args.json) {
+    fs.mkdirSync(path.dirname(path.resolve(args.json)), { recursive: true });
+    fs.writeFileSync(args.json, `${JSON.stringify(output, null, 2)}\n`);
+    process.stdout.write(`\nwrote ${args.json}\n`);
+  }
+  if (args.compare) {
+    const baseline = JSON.parse(fs.readFileSync(args.compare, "utf8"));
+    const regressions = compare(baseline, results, args.threshold);
+    if (regressions > 0) {
+      process.stdout.write(`${regressions} cases more than ${args.threshold * 100}% slower than ${args.compare}\n`);
+      process.exitCode = 1;
+    }
+  }
+  if (sink === -1) process.stdout.write("\n"); // keep results observable
+}
+
+main();
@@ -1,16 +1,9 @@
 #!/usr/bin/env node
 
-const { execFileSync } = require("node:child_process");
-const path = require("node:path");
+const { createRenderer } = require("..");
 
-const TOOL = path.join(__dirname, "..", "bin", "cellgauge.js");
-
-function run(args) {
-  return execFileSync(TOOL, args, { encoding: "utf8" }).replace(/\n$/, "");
-}
-
-function row(label, args) {
-  const text = run(args);
+function row(label, options, values) {
+  const text = createRenderer(options).render(values);
   const padded = `${label}:`.padEnd(24, " ");
   process.stdout.write(`${padded}${text}\n`);
 }
@@ -20,27 +13,27 @@ function section(title) {
 }
 
 section("Bar1 (single lane)");
-row("h+border", ["13", "--border"]);
-row("h no-border", ["29"]);
-row("full+border", ["44", "--full", "--border"]);
-row("full no-border", ["58", "--full"]);
-row("gapped h+border", ["71", "--gapped", "--border"]);
-row("gapped h no-border", ["83", "--gapped"]);
-row("gapped full+border", ["92", "--gapped", "--full", "--border"]);
-row("gapped full no-border", ["36", "--gapped", "--full"]);
+row("h+border", { border: true }, [13]);
+row("h no-border", {}, [29]);
+row("full+border", { full: true, border: true }, [44]);
+row("full no-border", { full: true }, [58]);
+row("gapped h+border", { gapped: true, border: true }, [71]);
+row("gapped h no-border", { gapped: true }, [83]);
+row("gapped full+border", { gapped: true, full: true, border: true }, [92]);
+row("gapped full no-border", { gapped: true, full: true }, [36]);
 
 section("Bar2 (two lanes)");
-row("h+border", ["22", "68", "--border"]);
-row("gapped h+border", ["41", "79", "--gapped", "--border"]);
-row("gapped full no-border", ["63", "17", "--gapped", "--full"]);
+row("h+border", { lanes: 2, border: true }, [22, 68]);
+row("gapped h+border", { lanes: 2, gapped: true, border: true }, [41, 79]);
+row("gapped full no-border", { lanes: 2, gapped: true, full: true }, [63, 17]);
 
 section("Bar3 (three lanes)");
-row("h+border", ["14", "47", "86", "--border"]);
-row("gapped h+border", ["28", "66", "91", "--gapped", "--border"]);
-row("gapped full no-border", ["73", "39", "55", "--gapped", "--full"]);
+row("h+border", { lanes: 3, border: true }, [14, 47, 86]);
+row("gapped h+border", { lanes: 3, gapped: true, border: true }, [28, 66, 91]);
+row("gapped full no-border", { lanes: 3, gapped: true, full: true }, [73, 39, 55]);
 
 section("Donut (single only)");
-row("h+border", ["12", "--donut", "--border"]);
-row("h no-border", ["34", "--donut"]);
-row("full+border", ["67", "--donut", "--full", "--border"]);
-row("full no-border", ["89", "--donut", "--full"]);
+row("h+border", { kind: "donut", border: true }, 12);
+row("h no-border", { kind: "donut" }, 34);
+row("full+border", { kind: "donut", full: true, border: true }, 67);
+row("full no-border", { kind: "donut", full: true }, 89);
@@ -0,0 +1,299 @@
+const readline = require("node:readline");
+const { DiffRenderer } = require("./diff");
+const { PACKAGED_FONT_PATH, defaultFontDir, installPackagedFont } = require("./font");
+const {
+  buildBarStyle,
+  buildDonutStyle,
+  createRenderer,
+  isNumericLiteral,
+} = require("./render");
+const { parseTemplate, renderTemplate } = require("./template");
+
+const BOOL_FLAGS = {
+  "--help": "help", "-h": "help",
+  "--donut": "donut", "--gapped": "gapped", "--full": "full", "--border": "border",
+  "--seam-space": "seamSpace",
+};
+
+// Options a --format template sets per gauge, so they cannot be given too.
+const TEMPLATE_OPTIONS = new Set(["--donut", "--gapped", "--full", "--border", "--no-border", "--width"]);
+
+function usage() {
+  return `\
+usage: cellgauge [percent ...] [options]
+       cellgauge stream
+       cellgauge font-path
+       cellgauge install-font [--font-dir PATH]
+
+note:
+  all numeric inputs are treated as percentages (0..100)
+
+options:
+  --width N        bar width (default: 8)
+  --gapped         use gapped style (default: no-gap)
+  --full           use full-height style (default: H-height)
+  --border         bordered style
+  --no-border      no-border style
+  --donut          render 2-cell donut (single percent only)
+  --seam-space     append one trailing ASCII space (optional seam workaround)
+  --format TPL     render several gauges from one template; positional
+                   values are referenced as $1, $2, ...
+
+template placeholders:
+  {bar:WIDTH:STYLE:VALUES}     lanes follow the number of values (1..3)
+  {bar1|bar2|bar3:WIDTH:STYLE:VALUES}
+  {donut:STYLE:VALUE}
+  VALUES is a comma list of $N references or literal percentages;
+  STYLE is a bar style (e.g. nhb, ghb, nfn) or donut style (hb, fb, hn, fn);
+  use {{ and }} for literal braces
+
+stream:
+  reads "<id> <row> <col> [percent ...] [options]" lines from stdin and
+  writes only the changed cells as cursor-addressed escape sequences
+
+examples:
+  cellgauge 42 --gapped --full --border
+  cellgauge 42 --donut --full --border
+  cellgauge 30 70 --gapped --border
+  cellgauge 23 67 91 --gapped --border
+  cellgauge --format 'cpu {bar:10:nhb:$1} bat {donut:fb:$2}' 42 80
+  printf 'cpu 1 10 42\\n' | cellgauge stream
+  cellgauge font-path
+  cellgauge install-font`;
+}
+
+function installUsage() {
+  return `\
+usage: cellgauge install-font [--font-dir PATH]
+
+options:
+  --font-dir PATH  target directory for CellGaugeSymbols.ttf`;
+}
+
+function parseArgs(argv) {
+  const out = {
+    donut: false,
+    width: 8,
+    gapped: false,
+    full: false,
+    border: false,
+    seamSpace: false,
+    format: null,
+    templateOptions: [],
+    values: [],
+  };
+
+  for (let i = 0; i < argv.length; i += 1) {
+    const a = argv[i];
+    const name = a.split("=", 1)[0];
+    if (TEMPLATE_OPTIONS.has(name) && !out.templateOptions.includes(name)) {
+      out.templateOptions.push(name);
+    }
+    if (BOOL_FLAGS[a]) {
+      out[BOOL_FLAGS[a]] = true;
+      continue;
+    }
+    if (a === "--no-border") {
+      out.border = false;
+      continue;
+    }
+    if (a.startsWith("--width=")) {
+      out.width = Number.parseInt(a.slice("--width=".length), 10);
+      continue;
+    }
+    if (a === "--width" && i + 1 < argv.length) {
+      out.width = Number.parseInt(argv[i + 1], 10);
+      i += 1;
+      continue;
+    }
+    if (a.startsWith("--format=")) {
+      out.format = a.slice("--format=".length);
+      continue;
+    }
+    if (a === "--format" && i + 1 < argv.length) {
+      out.format = argv[i + 1];
+      i += 1;
+      continue;
+    }
+    if (a.startsWith("-")) {
+      const parts = a.split(",").map((p) => p.trim()).filter((p) => p !== "");
+      if (parts.length > 0 && parts.every((p) => isNumericLiteral(p))) {
+        throw new Error("negative percent values are not allowed");
+      }
+      throw new Error(`unknown option: ${a}`);
+    }
+
+    // positional value(s); supports comma-separated list too
+    for (const piece of a.split(",")) {
+      const token = piece.trim();
+      if (token === "") continue;
+      if (isNumericLiteral(token) && Number(token) < 0) {
+        throw new Error("negative percent values are not allowed");
+      }
+      out.values.push(token);
+    }
+  }
+
+  return out;
+}
+
+function parseInstallFontArgs(argv) {
+  const out = {
+    help: false,
+    fontDir: null,
+  };
+
+  for (let i = 0; i < argv.length; i += 1) {
+    const a = argv[i];
+    if (a === "--help" || a === "-h") {
+      out.help = true;
+      continue;
+    }
+    if (a.startsWith("--font-dir=")) {
+      out.fontDir = a.slice("--font-dir=".length);
+      continue;
+    }
+    if (a === "--font-dir" && i + 1 < argv.length) {
+      out.fontDir = argv[i + 1];
+      i += 1;
+      continue;
+    }
+    throw new Error(`unknown option for install-font: ${a}`);
+  }
+
+  if (out.help) {
+    return out;
+  }
+
+  out.fontDir = out.fontDir || defaultFontDir();
+  if (!out.fontDir) {
+    throw new Error("unable to infer default font directory on this platform; use --font-dir");
+  }
+
+  return out;
+}
+
+function rendererOptionsFromArgs(args) {
+  if (args.donut) return { kind: "donut", full: args.full, border: args.border };
+  return {
+    kind: "bar",
+    width: Math.max(1, Math.trunc(args.width)),
+    lanes: Math.max(1, Math.min(3, args.values.length || 1)),
+    gapped: args.gapped,
+    full: args.full,
+    border: args.border,
+  };
+}
+
+function renderFromArgs(args) {
+  if (!Number.isFinite(args.width) || args.width <= 0) {
+    throw new Error("--width must be a positive integer");
+  }
+  if (args.donut && args.values.length > 1) {
+    throw new Error("--donut accepts a single percent value");
+  }
+
+  const renderer = createRenderer(rendererOptionsFromArgs(args));
+  const glyph = renderer.render(args.values);
+  if ([...glyph].length !== renderer.width) throw new Error(`${renderer.kind} output width mismatch`);
+  return glyph;
+}
+
+function layoutKeyFromArgs(args) {
+  if (args.donut) return `donut:${buildDonutStyle(args.full, args.border)}`;
+  const lanes = Math.max(1, Math.min(3, args.values.length || 1));
+  const gapped = lanes === 1 ? false : args.gapped;
+  return `bar${lanes}:${Math.trunc(args.width)}:${buildBarStyle(gapped, args.full, args.border)}`;
+}
+
+function parseStreamLine(line) {
+  const tokens = line.trim().split(/\s+/);
+  if (tokens.length < 3) {
+    throw new Error("stream lines need <id> <row> <col> [percent ...] [options]");
+  }
+  const [id, rowToken, colToken, ...rest] = tokens;
+  const row = Number.parseInt(rowToken, 10);
+  const col = Number.parseInt(colToken, 10);
+  if (!Number.isFinite(row) || row <= 0 || !Number.isFinite(col) || col <= 0) {
+    throw new Error("stream row and col must be positive integers");
+  }
+  const args = parseArgs(rest);
+  // Whole-line options have no meaning for a single positioned gauge.
+  for (const [flag, set] of [
+    ["--format", args.format !== null],
+    ["--seam-space", args.seamSpace],
+    ["--help", args.help],
+  ]) {
+    if (set) throw new Error(`${flag} is not supported on stream lines`);
+  }
+  return { id, row, col, args };
+}
+
+function runStream() {
+  const renderer = new DiffRenderer();
+  const rl = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+  rl.on("line", (line) => {
+    if (line.trim() === "") return;
+    try {
+      const { id, row, col, args } = parseStreamLine(line);
+      const cells = Array.from(renderFromArgs(args));
+      const out = renderer.update(id, row, col, cells, layoutKeyFromArgs(args));
+      if (out !== "") process.stdout.write(out);
+    } catch (err) {
+      // Keep long-running dashboards alive on a single bad line.
+      process.stderr.write(`cellgauge: ${err.message || err}\n`);
+    }
+  });
+}
+
+function main(argv) {
+  if (argv[0] === "font-path") {
+    process.stdout.write(`${PACKAGED_FONT_PATH}\n`);
+    return;
+  }
+
+  if (argv[0] === "install-font") {
+    const installArgs = parseInstallFontArgs(argv.slice(1));
+    if (installArgs.help) {
+      process.stdout.write(`${installUsage()}\n`);
+      return;
+    }
+    const installed = installPackagedFont(installArgs.fontDir);
+    process.stderr.write(`cellgauge: font ${installed.status}\n`);
+    process.stdout.write(`${installed.path}\n`);
+    return;
+  }
+
+  if (argv[0] === "stream") {
+    if (argv.length > 1) {
+      throw new Error(`unknown option for stream: ${argv[1]}`);
+    }
+    runStream();
+    return;
+  }
+
+  const args = parseArgs(argv);
+  if (args.help) {
+    process.stdout.write(`${usage()}\n`);
+    return;
+  }
+
+  if (args.format !== null) {
+    if (args.templateOptions.length > 0) {
+      throw new Error(`--format gauges set their own kind, style and width: ${args.templateOptions.join(", ")}`);
+    }
+    const glyph = renderTemplate(parseTemplate(args.format), args.values);
+    const out = args.seamSpace ? `${glyph} ` : glyph;
+    process.stdout.write(`${out}\n`);
+    return;
+  }
+
+  const glyph = renderFromArgs(args);
+  const out = args.seamSpace ? `${glyph} ` : glyph;
+  process.stdout.write(`${out}\n`);
+}
+
+module.exports = {
+  main,
+  parseArgs,
+};
@@ -0,0 +1,56 @@
+class DiffRenderer {
+  constructor() {
+    this.gauges = new Map();
+  }
+
+  // Returns the escape sequences that bring gauge `id` from its previously
+  // drawn cells to `cells`.  Rows and columns are 1-based terminal
+  // coordinates; every cell is assumed to occupy one column.
+  update(id, row, col, cells, layoutKey) {
+    const prev = this.gauges.get(id);
+    this.gauges.set(id, { row, col, cells, layoutKey });
+
+    if (!prev || prev.row !== row || prev.col !== col) {
+      // A moved gauge is erased at its old position before being drawn.
+      const erase = prev ? cursorTo(prev.row, prev.col) + " ".repeat(prev.cells.length) : "";
+      return erase + cursorTo(row, col) + cells.join("");
+    }
+    if (prev.layoutKey !== layoutKey) {
+      // Blank out any tail left behind by a previously wider gauge.
+      const stale = Math.max(0, prev.cells.length - cells.length);
+      return cursorTo(row, col) + cells.join("") + " ".repeat(stale);
+    }
+
+    let out = "";
+    let i = 0;
+    while (i < cells.length) {
+      if (cells[i] === prev.cells[i]) {
+        i += 1;
+        continue;
+      }
+      let end = i + 1;
+      for (;;) {
+        while (end < cells.length && cells[end] !== prev.cells[end]) end += 1;
+        // Rewriting a short unchanged gap is cheaper than a new cursor move.
+        let next = end;
+        while (next < cells.length && cells[next] === prev.cells[next]) next += 1;
+        if (next >= cells.length) break;
+        const gapBytes = Buffer.byteLength(cells.slice(end, next).join(""));
+        if (gapBytes >= cursorTo(row, col + next).length) break;
+        end = next;
+      }
+      out += cursorTo(row, col + i) + cells.slice(i, end).join("");
+      i = end;
+    }
+    return out;
+  }
+}
+
+function cursorTo(row, col) {
+  return `\x1b[${row};${col}H`;
+}
+
+module.exports = {
+  DiffRenderer,
+  cursorTo,
+};
@@ -0,0 +1,74 @@
+const crypto = require("node:crypto");
+const fs = require("node:fs");
+const os = require("node:os");
+const path = require("node:path");
+const { spawnSync } = require("node:child_process");
+
+const PACKAGED_FONT_FILE = "CellGaugeSymbols.ttf";
+const PACKAGED_FONT_PATH = path.resolve(__dirname, "..", "fonts", PACKAGED_FONT_FILE);
+
+function defaultFontDir() {
+  if (process.platform === "darwin") {
+    return path.join(os.homedir(), "Library", "Fonts");
+  }
+  if (process.platform === "linux") {
+    return path.join(os.homedir(), ".local", "share", "fonts");
+  }
+  if (process.platform === "win32") {
+    const localAppData = process.env.LOCALAPPDATA || path.join(os.homedir(), "AppData", "Local");
+    return path.join(localAppData, "Microsoft", "Windows", "Fonts");
+  }
+  return null;
+}
+
+function refreshLinuxFontCache(fontDir) {
+  if (process.platform !== "linux") return;
+  // Without -f, fc-cache only rescans directories whose mtime changed.
+  spawnSync("fc-cache", [fontDir], { stdio: "ignore" });
+}
+
+function fileDigest(filePath) {
+  return crypto.createHash("sha256").update(fs.readFileSync(filePath)).digest("hex");
+}
+
+function sameContents(a, b) {
+  // A size mismatch settles it without reading either file.
+  return fs.statSync(a).size === fs.statSync(b).size && fileDigest(a) === fileDigest(b);
+}
+
+function copyAtomic(src, dest) {
+  // Write next to the target so the rename stays on one filesystem.
+  const tmpPath = path.join(path.dirname(dest), `.${path.basename(dest)}.${process.pid}.tmp`);
+  try {
+    fs.copyFileSync(src, tmpPath);
+    fs.renameSync(tmpPath, dest);
+  } catch (err) {
+    fs.rmSync(tmpPath, { force: true });
+    throw err;
+  }
+}
+
+// Copy the packaged font into fontDir unless an identical copy is already
+// there. status is "installed", "updated" or "up-to-date".
+function installPackagedFont(fontDir) {
+  if (!fs.existsSync(PACKAGED_FONT_PATH)) {
+    throw new Error(`packaged font missing: ${PACKAGED_FONT_PATH}`);
+  }
+  const resolvedDir = path.resolve(fontDir);
+  const outPath = path.join(resolvedDir, PACKAGED_FONT_FILE);
+  const existed = fs.existsSync(outPath);
+  if (existed && sameContents(PACKAGED_FONT_PATH, outPath)) {
+    return { path: outPath, status: "up-to-date" };
+  }
+  fs.mkdirSync(resolvedDir, { recursive: true });
+  copyAtomic(PACKAGED_FONT_PATH, outPath);
+  refreshLinuxFontCache(resolvedDir);
+  return { path: outPath, status: existed ? "updated" : "installed" };
+}
+
+module.exports = {
+  PACKAGED_FONT_FILE,
+  PACKAGED_FONT_PATH,
+  defaultFontDir,
+  installPackagedFont,
+};
@@ -0,0 +1,112 @@
+/** Bar style id: <g|n> gap, <h|f> H-height/full, <b|n> border. */
+export type BarStyleId = "ghb" | "gfb" | "nhb" | "nfb" | "ghn" | "gfn" | "nhn" | "nfn";
+/** Donut style id: <h|f> H-height/full, <b|n> border. */
+export type DonutStyleId = "hb" | "fb" | "hn" | "fn";
+
+/** A percentage (0..100); out-of-range and non-numeric values are clamped. */
+export type Percent = number | string;
+
+/** One glyph family of a parsed layout, resolved to a flat codepoint table. */
+export interface GlyphFamily {
+  readonly name: string;
+  readonly base: number;
+  readonly lanes: number;
+  readonly levels: number;
+  readonly stride: number;
+  /** States per variant: stride ** lanes. */
+  readonly states: number;
+  readonly styles: readonly string[];
+  readonly variants: readonly string[];
+  /** Table entries per style: variants.length * states. */
+  readonly styleBlock: number;
+  /** Slots the font has a glyph for; renderers reject a family with none. */
+  readonly glyphs: number;
+  /** Codepoint per slot (style * styleBlock + variant * states + state); 0 renders as a space. */
+  readonly codepoints: Uint32Array;
+}
+
+export interface GlyphLayout {
+  readonly families: Readonly<Record<string, GlyphFamily>>;
+}
+
+/** Parse a glyph layout table emitted by scripts/font/glyph_layout.py. */
+export function parseLayout(data: Uint8Array): GlyphLayout;
+/** Read and parse a glyph layout file. */
+export function loadLayout(file: string): GlyphLayout;
+/** The layout of the packaged font (read once, then cached). */
+export function packagedLayout(): GlyphLayout;
+
+export interface BarRendererOptions {
+  kind?: "bar";
+  /** Output width in cells (default 8). */
+  width?: number;
+  /** Number of stacked lanes (default 1). */
+  lanes?: 1 | 2 | 3;
+  /** Gap between lanes; ignored for single-lane bars. */
+  gapped?: boolean;
+  full?: boolean;
+  border?: boolean;
+  /** Glyph layout to render against (default: the packaged font's). */
+  layout?: GlyphLayout;
+}
+
+export interface DonutRendererOptions {
+  kind: "donut";
+  full?: boolean;
+  border?: boolean;
+  layout?: GlyphLayout;
+}
+
+export type RendererOptions = BarRendererOptions | DonutRendererOptions;
+
+export interface Renderer {
+  readonly kind: "bar" | "donut";
+  /** Output width in cells. */
+  readonly width: number;
+  readonly lanes: 1 | 2 | 3;
+  readonly style: BarStyleId | DonutStyleId;
+  /** Render one value per lane (bar) or one value (donut). */
+  render(values: Percent | readonly Percent[]): string;
+}
+
+export function createRenderer(options?: RendererOptions): Renderer;
+
+export function renderBar(pcts: readonly Percent[], width: number, styleId: BarStyleId, layout?: GlyphLayout): string;
+export function renderDonut(pct: Percent, styleId: DonutStyleId, layout?: GlyphLayout): string;
+
+export function buildBarStyle(gapped: boolean, full: boolean, border: boolean): BarStyleId;
+export function buildDonutStyle(full: boolean, border: boolean): DonutStyleId;
+
+export class DiffRenderer {
+  constructor();
+  /**
+   * Escape sequences that bring gauge `id` from its last drawn cells to
+   * `cells`; `row`/`col` are 1-based. A changed `layoutKey` forces a full redraw.
+   */
+  update(id: string, row: number, col: number, cells: readonly string[], layoutKey: string): string;
+}
+
+export interface TemplatePart {
+  readonly text?: string;
+  readonly renderer?: Renderer;
+}
+
+/** Parse a --format template such as "cpu {bar:10:nhb:$1}". */
+export function parseTemplate(format: string): TemplatePart[];
+/** Render parsed template parts; `$N` refers to values[N - 1]. */
+export function renderTemplate(parts: readonly TemplatePart[], values: readonly Percent[]): string;
+
+/** Absolute path of the packaged CellGaugeSymbols.ttf. */
+export const fontPath: string;
+/** Outcome of installFont(). */
+export interface FontInstallResult {
+  /** Absolute path of the installed font. */
+  readonly path: string;
+  /** "up-to-date" when an identical copy was already in place. */
+  readonly status: "installed" | "updated" | "up-to-date";
+}
+/**
+ * Copy the packaged font into `fontDir` (default: the per-user font dir) unless an
+ * identical copy is already there.
+ */
+export function installFont(fontDir?: string): FontInstallResult;
@@ -0,0 +1,34 @@
+const { DiffRenderer } = require("./diff");
+const { PACKAGED_FONT_PATH, defaultFontDir, installPackagedFont } = require("./font");
+const { loadLayout, packagedLayout, parseLayout } = require("./layout");
+const {
+  buildBarStyle,
+  buildDonutStyle,
+  createRenderer,
+  renderBar,
+  renderDonut,
+} = require("./render");
+const { parseTemplate, renderTemplate } = require("./template");
+
+function installFont(fontDir = defaultFontDir()) {
+  if (!fontDir) {
+    throw new Error("unable to infer default font directory on this platform; pass fontDir");
+  }
+  return installPackagedFont(fontDir);
+}
+
+module.exports = {
+  DiffRenderer,
+  buildBarStyle,
+  buildDonutStyle,
+  createRenderer,
+  fontPath: PACKAGED_FONT_PATH,
+  installFont,
+  loadLayout,
+  packagedLayout,
+  parseLayout,
+  parseTemplate,
+  renderBar,
+  renderDonut,
+  renderTemplate,
+};
@@ -0,0 +1,112 @@
+const fs = require("node:fs");
+const path = require("node:path");
+
+// Binary glyph layout emitted by scripts/font/glyph_layout.py next to the
+// built font.  See that script for the on-disk format.
+const LAYOUT_MAGIC = "CGLT";
+const LAYOUT_VERSION = 1;
+const HEADER_SIZE = 8;
+const FAMILY_SIZE = 44;
+const REDIRECT_SIZE = 12;
+const SPACE_TARGET = 0xffffffff;
+
+const PACKAGED_LAYOUT_PATH = path.resolve(__dirname, "..", "fonts", "CellGaugeSymbols.layout");
+
+let packaged = null;
+
+function parseFamily(buf, offset) {
+  const name = buf.toString("ascii", offset, offset + 8).replace(/\0+$/, "");
+  const base = buf.readUInt32LE(offset + 8);
+  const lanes = buf.readUInt16LE(offset + 12);
+  const levels = buf.readUInt16LE(offset + 14);
+  const slotCount = buf.readUInt32LE(offset + 20);
+  const bitmapOffset = buf.readUInt32LE(offset + 24);
+  const redirectOffset = buf.readUInt32LE(offset + 28);
+  const redirectCount = buf.readUInt32LE(offset + 32);
+  const namesOffset = buf.readUInt32LE(offset + 36);
+  const namesLength = buf.readUInt16LE(offset + 40);
+
+  const [styleNames, variantNames] = buf.toString("ascii", namesOffset, namesOffset + namesLength).split("|");
+  const stride = levels + 1;
+  const states = stride ** lanes;
+
+  // Resolve every slot to the codepoint the renderer should emit, so that a
+  // render is one indexed read per cell.  0 means "emit a space": either an
+  // explicit space redirect or a state the font does not have.
+  const present = (slot) => (buf[bitmapOffset + (slot >> 3)] >> (slot & 7)) & 1;
+  const codepoints = new Uint32Array(slotCount);
+  let glyphs = 0;
+  for (let slot = 0; slot < slotCount; slot += 1) {
+    if (present(slot)) {
+      codepoints[slot] = base + slot;
+      glyphs += 1;
+    }
+  }
+  for (let r = 0; r < redirectCount; r += 1) {
+    const at = redirectOffset + r * REDIRECT_SIZE;
+    const first = buf.readUInt32LE(at);
+    const count = buf.readUInt32LE(at + 4);
+    const target = buf.readUInt32LE(at + 8);
+    if (target === SPACE_TARGET) continue;
+    for (let i = 0; i < count; i += 1) {
+      if (present(target + i)) codepoints[first + i] = base + target + i;
+    }
+  }
+
+  return {
+    name,
+    base,
+    lanes,
+    levels,
+    stride,
+    states,
+    styles: styleNames.split(","),
+    variants: variantNames.split(","),
+    styleBlock: variantNames.split(",").length * states,
+    glyphs,
+    codepoints,
+  };
+}
+
+function parseLayout(buf) {
+  if (buf.length < HEADER_SIZE || buf.toString("ascii", 0, 4) !== LAYOUT_MAGIC) {
+    throw new Error("not a cellgauge glyph layout");
+  }
+  const version = buf.readUInt16LE(4);
+  if (version !== LAYOUT_VERSION) {
+    throw new Error(`unsupported glyph layout version: ${version}`);
+  }
+  const families = {};
+  const count = buf.readUInt16LE(6);
+  for (let i = 0; i < count; i += 1) {
+    const family = parseFamily(buf, HEADER_SIZE + i * FAMILY_SIZE);
+    families[family.name] = family;
+  }
+  return { families };
+}
+
+function loadLayout(file) {
+  return parseLayout(fs.readFileSync(file));
+}
+
+// The layout shipped with the packaged font, read on first use.
+function packagedLayout() {
+  if (!packaged) packaged = loadLayout(PACKAGED_LAYOUT_PATH);
+  return packaged;
+}
+
+function layoutFamily(layout, name) {
+  const family = layout.families[name];
+  if (!family) throw new Error(`glyph layout has no ${name} family`);
+  // A family the font has no glyphs for would render as nothing but spaces.
+  if (family.glyphs === 0) throw new Error(`glyph layout has no ${name} glyphs; rebuild the font`);
+  return family;
+}
+
+module.exports = {
+  PACKAGED_LAYOUT_PATH,
+  layoutFamily,
+  loadLayout,
+  packagedLayout,
+  parseLayout,
+};
@@ -0,0 +1,197 @@
+const { layoutFamily, packagedLayout } = require("./layout");
+
+const BAR_STYLE_IDS = ["ghb", "gfb", "nhb", "nfb", "ghn", "gfn", "nhn", "nfn"];
+const BAR_LANES = [1, 2, 3];
+const DONUT_STYLE_IDS = ["hb", "fb", "hn", "fn"];
+
+function clampPct(value) {
+  const n = Number(value);
+  if (!Number.isFinite(n)) return 0;
+  return Math.max(0, Math.min(100, n));
+}
+
+function pctToUnits(pct, widthCells, levels) {
+  return Math.round((clampPct(pct) / 100) * widthCells * levels);
+}
+
+function laneLevel(units, idx, levels) {
+  const r = units - idx * levels;
+  if (r <= 0) return 0;
+  if (r >= levels) return levels;
+  return r;
+}
+
+function isNoBorderStyle(styleId) {
+  return styleId.endsWith("n");
+}
+
+function buildBarStyle(gapped, full, border) {
+  return `${gapped ? "g" : "n"}${full ? "f" : "h"}${border ? "b" : "n"}`;
+}
+
+function buildDonutStyle(full, border) {
+  return `${full ? "f" : "h"}${border ? "b" : "n"}`;
+}
+
+function variantForIndex(i, width, noBorder = false) {
+  if (noBorder) {
+    return "m";
+  }
+  if (width === 1) return "s";
+  if (i === 0) return "l";
+  if (i === width - 1) return "r";
+  return "m";
+}
+
+// Offset of a style's block within a family's codepoint table.
+function styleOffset(family, styleId) {
+  const index = family.styles.indexOf(styleId);
+  if (index < 0) throw new Error(`unknown ${family.name} style: ${styleId}`);
+  return index * family.styleBlock;
+}
+
+// Table entries are 0 for cells the font renders as a plain space.
+function cellText(cp) {
+  return cp === 0 ? " " : String.fromCodePoint(cp);
+}
+
+function donutLayout(styleId, glyphs = packagedLayout()) {
+  const family = layoutFamily(glyphs, "donut2");
+  const left = styleOffset(family, styleId);
+  return { family, left, right: left + family.states };
+}
+
+function renderDonutLayout(layout, pct) {
+  const { family, left, right } = layout;
+  const level = Math.round((clampPct(pct) / 100) * family.levels);
+  return cellText(family.codepoints[left + level]) + cellText(family.codepoints[right + level]);
+}
+
+function renderDonut(pct, styleId, glyphs) {
+  return renderDonutLayout(donutLayout(styleId, glyphs), pct);
+}
+
+// Cell indices where a run of identical cells may start: every lane is
+// full before floor(units / levels), partial at that cell, and empty after
+// it, and bordered bars change variant at both ends.
+function barRunStarts(allUnits, width, levels, noBorder) {
+  const starts = [0, width];
+  for (const u of allUnits) {
+    const full = Math.floor(u / levels);
+    starts.push(Math.min(full, width), Math.min(full + 1, width));
+  }
+  if (!noBorder) starts.push(Math.min(1, width), Math.max(0, width - 1));
+  return [...new Set(starts)].sort((a, b) => a - b);
+}
+
+// Everything about a bar that does not depend on the percentages.
+function barLayout(lanes, width, styleId, glyphs = packagedLayout()) {
+  const family = layoutFamily(glyphs, `bar${lanes}`);
+  const noBorder = isNoBorderStyle(styleId);
+  const offset = styleOffset(family, styleId);
+  const variantOffset = (variant) => offset + family.variants.indexOf(variant) * family.states;
+  return {
+    family,
+    width,
+    noBorder,
+    // Variant offsets by position; hidden caps and no-border variants are
+    // already redirected inside the table, so the lookup needs no fallback.
+    left: variantOffset(variantForIndex(0, width, noBorder)),
+    middle: variantOffset(variantForIndex(1, Math.max(width, 3), noBorder)),
+    right: variantOffset(variantForIndex(width - 1, width, noBorder)),
+  };
+}
+
+function renderBarLayout(layout, pcts) {
+  const { family, width, noBorder } = layout;
+  const { codepoints, levels, stride } = family;
+  const allUnits = pcts.map((p) => pctToUnits(p, width, levels));
+  const starts = barRunStarts(allUnits, width, levels, noBorder);
+
+  let out = "";
+  for (let k = 0; k + 1 < starts.length; k += 1) {
+    const i = starts[k];
+    const runLength = starts[k + 1] - i;
+    if (runLength <= 0) continue;
+    let state = 0;
+    for (const u of allUnits) state = state * stride + laneLevel(u, i, levels);
+    const offset = i === 0 ? layout.left : i === width - 1 ? layout.right : layout.middle;
+    out += cellText(codepoints[offset + state]).repeat(runLength);
+  }
+  return out;
+}
+
+function renderBar(pcts, width, styleId, glyphs) {
+  return renderBarLayout(barLayout(pcts.length, width, styleId, glyphs), pcts);
+}
+
+function isNumericLiteral(value) {
+  return /^[+-]?(?:\d+\.?\d*|\.\d+)$/.test(String(value));
+}
+
+function takeLaneValues(values, lanes) {
+  return Array.from({ length: lanes }, (_, i) => clampPct(values[i] ?? 0));
+}
+
+function toValueList(values) {
+  if (values === undefined || values === null) return [];
+  return Array.isArray(values) ? values : [values];
+}
+
+// Validates renderer options once and captures the style and codepoint
+// layout, so render() only does the per-value work.  options.layout is a
+// parsed glyph layout (see ./layout); it defaults to the packaged font's.
+function createRenderer(options = {}) {
+  const kind = options.kind ?? "bar";
+  const glyphs = options.layout ?? packagedLayout();
+  const full = Boolean(options.full);
+  const border = Boolean(options.border);
+
+  if (kind === "donut") {
+    const style = buildDonutStyle(full, border);
+    const layout = donutLayout(style, glyphs);
+    return Object.freeze({
+      kind,
+      width: 2,
+      lanes: 1,
+      style,
+      render: (values) => renderDonutLayout(layout, toValueList(values)[0] ?? 0),
+    });
+  }
+
+  const width = options.width ?? 8;
+  if (!Number.isInteger(width) || width <= 0) {
+    throw new Error("width must be a positive integer");
+  }
+
+  if (kind !== "bar") {
+    throw new Error(`unknown renderer kind: ${kind}`);
+  }
+  const lanes = options.lanes ?? 1;
+  if (!BAR_LANES.includes(lanes)) {
+    throw new Error("lanes must be 1, 2 or 3");
+  }
+  // Single-lane bars have no inter-lane gap, so treat gapped as a no-op.
+  const style = buildBarStyle(lanes > 1 && Boolean(options.gapped), full, border);
+  const layout = barLayout(lanes, width, style, glyphs);
+  return Object.freeze({
+    kind,
+    width,
+    lanes,
+    style,
+    render: (values) => renderBarLayout(layout, takeLaneValues(toValueList(values), lanes)),
+  });
+}
+
+module.exports = {
+  BAR_STYLE_IDS,
+  DONUT_STYLE_IDS,
+  buildBarStyle,
+  buildDonutStyle,
+  clampPct,
+  createRenderer,
+  isNumericLiteral,
+  renderBar,
+  renderDonut,
+  takeLaneValues,
+};
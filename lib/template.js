@@ -0,0 +1,133 @@
+const {
+  BAR_STYLE_IDS,
+  DONUT_STYLE_IDS,
+  clampPct,
+  createRenderer,
+  isNumericLiteral,
+} = require("./render");
+
+const TEMPLATE_KINDS = {
+  bar: { lanes: null },
+  bar1: { lanes: 1 },
+  bar2: { lanes: 2 },
+  bar3: { lanes: 3 },
+  donut: { lanes: null },
+};
+
+function parseTemplateValues(raw, spec) {
+  const values = raw.split(",").map((v) => v.trim());
+  if (values.some((v) => v === "")) {
+    throw new Error(`template: empty value in ${spec}`);
+  }
+  return values.map((v) => {
+    const ref = /^\$(\d+)$/.exec(v);
+    if (ref) {
+      const index = Number.parseInt(ref[1], 10);
+      if (index < 1) throw new Error(`template: invalid reference ${v} in ${spec}`);
+      return { ref: index };
+    }
+    if (!isNumericLiteral(v)) throw new Error(`template: invalid value ${v} in ${spec}`);
+    if (Number(v) < 0) throw new Error("negative percent values are not allowed");
+    return { literal: v };
+  });
+}
+
+function parseTemplateWidth(raw, spec) {
+  if (!/^\d+$/.test(raw) || Number.parseInt(raw, 10) <= 0) {
+    throw new Error(`template: width must be a positive integer in ${spec}`);
+  }
+  return Number.parseInt(raw, 10);
+}
+
+function parseTemplateGauge(body) {
+  const spec = `{${body}}`;
+  const fields = body.split(":");
+  const kind = fields[0];
+  if (!TEMPLATE_KINDS[kind]) throw new Error(`template: unknown gauge kind in ${spec}`);
+
+  if (kind === "donut") {
+    if (fields.length !== 3) throw new Error(`template: expected {donut:STYLE:VALUE}, got ${spec}`);
+    const [, style, raw] = fields;
+    if (!DONUT_STYLE_IDS.includes(style)) throw new Error(`template: unknown donut style in ${spec}`);
+    const values = parseTemplateValues(raw, spec);
+    if (values.length !== 1) throw new Error(`template: donut takes a single value in ${spec}`);
+    const renderer = createRenderer({ kind, full: style[0] === "f", border: style[1] === "b" });
+    return { renderer, values };
+  }
+
+  if (fields.length !== 4) throw new Error(`template: expected {${kind}:WIDTH:STYLE:VALUES}, got ${spec}`);
+  const [, rawWidth, style, raw] = fields;
+  const width = parseTemplateWidth(rawWidth, spec);
+  const values = parseTemplateValues(raw, spec);
+
+  if (!BAR_STYLE_IDS.includes(style)) throw new Error(`template: unknown bar style in ${spec}`);
+  const renderer = createRenderer({
+    kind: "bar",
+    width,
+    lanes: TEMPLATE_KINDS[kind].lanes || Math.min(3, values.length),
+    gapped: style[0] === "g",
+    full: style[1] === "f",
+    border: style[2] === "b",
+  });
+  return { renderer, values };
+}
+
+// Splits a --format template into literal text and gauge placeholders once,
+// so the gauges can be rendered repeatedly against fresh values.
+function parseTemplate(format) {
+  const parts = [];
+  let text = "";
+  let i = 0;
+  while (i < format.length) {
+    const ch = format[i];
+    if ((ch === "{" || ch === "}") && format[i + 1] === ch) {
+      text += ch;
+      i += 2;
+      continue;
+    }
+    if (ch === "}") throw new Error("template: unmatched }");
+    if (ch !== "{") {
+      text += ch;
+      i += 1;
+      continue;
+    }
+    const end = format.indexOf("}", i + 1);
+    if (end < 0) throw new Error("template: unterminated placeholder");
+    if (text !== "") parts.push({ text });
+    text = "";
+    parts.push(parseTemplateGauge(format.slice(i + 1, end)));
+    i = end + 1;
+  }
+  if (text !== "") parts.push({ text });
+  return parts;
+}
+
+function resolveTemplateValues(gauge, values) {
+  return gauge.values.map((v) => {
+    if (v.literal !== undefined) return clampPct(v.literal);
+    if (v.ref > values.length) {
+      throw new Error(`template: references $${v.ref} but only ${values.length} value(s) given`);
+    }
+    return clampPct(values[v.ref - 1]);
+  });
+}
+
+function renderTemplate(parts, values) {
+  let out = "";
+  for (const part of parts) {
+    if (part.text !== undefined) {
+      out += part.text;
+      continue;
+    }
+    const { renderer } = part;
+    const glyph = renderer.render(resolveTemplateValues(part, values));
+    if ([...glyph].length !== renderer.width) throw new Error(`${renderer.kind} output width mismatch`);
+    out += glyph;
+  }
+  return out;
+}
+
+module.exports = {
+  parseTemplate,
+  renderTemplate,
+};
@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""
+Sample /proc metrics on one asyncio loop and emit rendered CellGauge lines.
+
+Replaces per-tick shell pipelines (cat /proc/... | awk | cellgauge) with a
+single long-lived process. Each gauge samples its metrics at its own
+interval; gauges sharing an interval share one timer and one read of each
+/proc file per tick. Glyphs are rendered in-process from the packaged glyph
+layout table (fonts/CellGaugeSymbols.layout), using the same codepoint math
+as lib/render.js. A line is written only when its rendered text changes.
+
+Usage:
+  python cellgauge_feed.py <config.json> [--layout PATH] [--output PATH]
+
+See docs/feed.md for the config format.
+"""
+
+import argparse
+import asyncio
+import errno
+import json
+import math
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+
+DEFAULT_LAYOUT = Path(__file__).resolve().parents[2] / "fonts" / "CellGaugeSymbols.layout"
+
+LAYOUT_MAGIC = b"CGLT"
+LAYOUT_VERSION = 1
+HEADER = struct.Struct("<4sHH")
+FAMILY = struct.Struct("<8sIHHHHIIIIIHH")
+REDIRECT = struct.Struct("<III")
+SPACE_TARGET = 0xFFFFFFFF
+
+BAR_LANES = (1, 2, 3)
+
+
+class ConfigError(ValueError):
+    pass
+
+
+# ---------------------------------------------------------------------------
+# Glyph layout and rendering (mirrors lib/layout.js and lib/render.js)
+# ---------------------------------------------------------------------------
+
+
+class GlyphFamily:
+    """One layout family resolved to a flat codepoint table (0 = space)."""
+
+    def __init__(self, data, record):
+        (
+            name,
+            base,
+            lanes,
+            levels,
+            _style_count,
+            _variant_count,
+            slot_count,
+            bitmap_offset,
+            redirect_offset,
+            redirect_count,
+            names_offset,
+            names_length,
+            _reserved,
+        ) = record
+        styles, variants = data[names_offset : names_offset + names_length].decode("ascii").split("|")
+        self.name = name.rstrip(b"\0").decode("ascii")
+        self.lanes = lanes
+        self.levels = levels
+        self.stride = levels + 1
+        self.states = self.stride**lanes
+        self.styles = styles.split(",")
+        self.variants = variants.split(",")
+        self.style_block = len(self.variants) * self.states
+
+        bitmap = data[bitmap_offset : bitmap_offset + (slot_count + 7) // 8]
+
+        def present(slot):
+            return (bitmap[slot >> 3] >> (slot & 7)) & 1
+
+        codepoints = [base + slot if present(slot) else 0 for slot in range(slot_count)]
+        for r in range(redirect_count):
+            first, count, target = REDIRECT.unpack_from(data, redirect_offset + r * REDIRECT.size)
+            if target == SPACE_TARGET:
+                continue
+            for i in range(count):
+                if present(target + i):
+                    codepoints[first + i] = base + target + i
+        self.codepoints = codepoints
+        self.glyphs = sum(map(present, range(slot_count)))
+
+    def style_offset(self, style):
+        if style not in self.styles:
+            raise ConfigError(f"unknown {self.name} style: {style}")
+        return self.styles.index(style) * self.style_block
+
+    def variant_offset(self, style, variant):
+        return self.style_offset(style) + self.variants.index(variant) * self.states
+
+
+def load_layout(path):
+    data = Path(path).read_bytes()
+    if len(data) < HEADER.size or data[:4] != LAYOUT_MAGIC:
+        raise ConfigError(f"not a cellgauge glyph layout: {path}")
+    _magic, version, count = HEADER.unpack_from(data, 0)
+    if version != LAYOUT_VERSION:
+        raise ConfigError(f"unsupported glyph layout version: {version}")
+    families = {}
+    for i in range(count):
+        family = GlyphFamily(data, FAMILY.unpack_from(data, HEADER.size + i * FAMILY.size))
+        families[family.name] = family
+    return families
+
+
+def layout_family(families, name):
+    if name not in families:
+        raise ConfigError(f"glyph layout has no {name} family")
+    if families[name].glyphs == 0:
+        raise ConfigError(f"glyph layout has no {name} glyphs; rebuild the font")
+    return families[name]
+
+
+def js_round(x):
+    # Math.round semantics (half up), not Python's round-half-even.
+    return math.floor(x + 0.5)
+
+
+def clamp_pct(value):
+    if not math.isfinite(value):
+        return 0.0
+    return max(0.0, min(100.0, value))
+
+
+def cell_text(cp):
+    return " " if cp == 0 else chr(cp)
+
+
+def variant_for_index(i, width, no_border):
+    if no_border:
+        return "m"
+    if width == 1:
+        return "s"
+    if i == 0:
+        return "l"
+    if i == width - 1:
+        return "r"
+    return "m"
+
+
+def build_bar_style(gapped, full, border):
+    return f"{'g' if gapped else 'n'}{'f' if full else 'h'}{'b' if border else 'n'}"
+
+
+def build_donut_style(full, border):
+    return f"{'f' if full else 'h'}{'b' if border else 'n'}"
+
+
+class BarRenderer:
+    def __init__(self, families, lanes, width, style):
+        family = layout_family(families, f"bar{lanes}")
+        no_border = style.endswith("n")
+        self.family = family
+        self.width = width
+        self.left = family.variant_offset(style, variant_for_index(0, width, no_border))
+        self.middle = family.variant_offset(style, variant_for_index(1, max(width, 3), no_border))
+        self.right = family.variant_offset(style, variant_for_index(width - 1, width, no_border))
+
+    def render(self, pcts):
+        family, width = self.family, self.width
+        levels, stride, codepoints = family.levels, family.stride, family.codepoints
+        units = [js_round(clamp_pct(p) / 100 * width * levels) for p in pcts]
+        out = []
+        for i in range(width):
+            state = 0
+            for u in units:
+                state = state * stride + min(max(u - i * levels, 0), levels)
+            offset = self.left if i == 0 else self.right if i == width - 1 else self.middle
+            out.append(cell_text(codepoints[offset + state]))
+        return "".join(out)
+
+
+class DonutRenderer:
+    def __init__(self, families, style):
+        self.family = layout_family(families, "donut2")
+        self.left = self.family.style_offset(style)
+        self.right = self.left + self.family.states
+
+    def render(self, pcts):
+        level = js_round(clamp_pct(pcts[0]) / 100 * self.family.levels)
+        codepoints = self.family.codepoints
+        return cell_text(codepoints[self.left + level]) + cell_text(codepoints[self.right + level])
+
+
+# ---------------------------------------------------------------------------
+# Metric sources
+# ---------------------------------------------------------------------------
+
+
+class ProcSnapshot:
+    """Reads each /proc file at most once per tick."""
+
+    def __init__(self, root="/proc"):
+        self.root = root
+        self.texts = {}
+
+    def read(self, name):
+        text = self.texts.get(name)
+        if text is None:
+            with open(os.path.join(self.root, name), encoding="ascii") as f:
+                text = f.read()
+            self.texts[name] = text
+        return text
+
+
+def parse_kv(text):
+    out = {}
+    for line in text.splitlines():
+        key, _, rest = line.partition(":")
+        fields = rest.split()
+        if fields:
+            out[key.strip()] = int(fields[0])
+    return out
+
+
+class CpuMetric:
+    """Busy share of a /proc/stat cpu line since the previous sample."""
+
+    def __init__(self, cpu="cpu"):
+        self.cpu = cpu
+        self.prev = None
+
+    def sample(self, snap, _now):
+        for line in snap.read("stat").splitlines():
+            fields = line.split()
+            if fields and fields[0] == self.cpu:
+                break
+        else:
+            raise ConfigError(f"no {self.cpu} line in /proc/stat")
+        # user nice system idle iowait irq softirq steal (guest time is
+        # already counted in user/nice).
+        ticks = [int(v) for v in fields[1:9]]
+        total = sum(ticks)
+        idle = ticks[3] + (ticks[4] if len(ticks) > 4 else 0)
+        prev, self.prev = self.prev, (total, idle)
+        if prev is not None:
+            total -= prev[0]
+            idle -= prev[1]
+        # The first sample covers everything since boot.
+        return 0.0 if total <= 0 else (total - idle) / total * 100
+
+
+class MemMetric:
+    """Used share of RAM (MemTotal - MemAvailable) or swap."""
+
+    def __init__(self, kind="mem"):
+        self.kind = kind
+
+    def sample(self, snap, _now):
+        info = parse_kv(snap.read("meminfo"))
+        if self.kind == "swap":
+            total = info.get("SwapTotal", 0)
+            used = total - info.get("SwapFree", 0)
+        else:
+            total = info["MemTotal"]
+            used = total - info.get("MemAvailable", info.get("MemFree", 0))
+        return 0.0 if total <= 0 else used / total * 100
+
+
+class LoadMetric:
+    """One-minute load average as a share of the online CPUs."""
+
+    def __init__(self):
+        self.cpus = os.cpu_count() or 1
+
+    def sample(self, snap, _now):
+        return float(snap.read("loadavg").split()[0]) / self.cpus * 100
+
+
+class NetMetric:
+    """Interface throughput in bytes/s as a share of a configured maximum."""
+
+    def __init__(self, iface, direction, max_rate):
+        self.iface = iface
+        self.column = 0 if direction == "rx" else 8
+        self.max_rate = max_rate
+        self.prev = None
+
+    def sample(self, snap, now):
+        for line in snap.read("net/dev").splitlines()[2:]:
+            name, _, rest = line.partition(":")
+            if name.strip() == self.iface:
+                count = int(rest.split()[self.column])
+                break
+        else:
+            # Interface gone (e.g. a VPN went down): report idle.
+            self.prev = None
+            return 0.0
+        prev, self.prev = self.prev, (count, now)
+        if prev is None or now <= prev[1] or count < prev[0]:
+            return 0.0
+        return (count - prev[0]) / (now - prev[1]) / self.max_rate * 100
+
+
+def parse_metric(spec, where):
+    if isinstance(spec, str):
+        spec = {"source": spec}
+    if not isinstance(spec, dict) or not isinstance(spec.get("source"), str):
+        raise ConfigError(f"{where}: metric must be a source string or an object with a source")
+    parts = spec["source"].split(":")
+    head = parts[0]
+    if head == "cpu" and len(parts) <= 2:
+        if len(parts) == 2 and not parts[1].isdigit():
+            raise ConfigError(f"{where}: cpu core must be a number: {spec['source']}")
+        return CpuMetric("cpu" + (parts[1] if len(parts) == 2 else ""))
+    if head in ("mem", "swap") and len(parts) == 1:
+        return MemMetric(head)
+    if head == "load" and len(parts) == 1:
+        return LoadMetric()
+    if head == "net" and len(parts) == 3 and parts[2] in ("rx", "tx"):
+        max_rate = spec.get("max")
+        if not isinstance(max_rate, (int, float)) or max_rate <= 0:
+            raise ConfigError(f"{where}: net metrics need a positive max (bytes/s)")
+        return NetMetric(parts[1], parts[2], float(max_rate))
+    raise ConfigError(f"{where}: unknown metric source: {spec['source']}")
+
+
+# ---------------------------------------------------------------------------
+# Gauges and output
+# ---------------------------------------------------------------------------
+
+
+class Gauge:
+    def __init__(self, gauge_id, interval, metrics, renderer):
+        self.id = gauge_id
+        self.interval = interval
+        self.metrics = metrics
+        self.renderer = renderer
+        self.text = renderer.render([0.0] * len(metrics))
+
+    def update(self, snap, now):
+        text = self.renderer.render([m.sample(snap, now) for m in self.metrics])
+        changed = text != self.text
+        self.text = text
+        return changed
+
+
+def parse_gauge(raw, index, families, default_interval):
+    if not isinstance(raw, dict):
+        raise ConfigError(f"gauges[{index}] must be an object")
+    gauge_id = raw.get("id")
+    if not isinstance(gauge_id, str) or not gauge_id:
+        raise ConfigError(f"gauges[{index}] needs a non-empty string id")
+    where = f"gauge {gauge_id}"
+
+    interval = raw.get("interval", default_interval)
+    if not isinstance(interval, (int, float)) or interval <= 0:
+        raise ConfigError(f"{where}: interval must be a positive number of seconds")
+
+    specs = raw.get("metrics")
+    if isinstance(specs, (str, dict)):
+        specs = [specs]
+    if not isinstance(specs, list) or not specs:
+        raise ConfigError(f"{where}: metrics must be a non-empty list")
+    metrics = [parse_metric(spec, where) for spec in specs]
+
+    kind = raw.get("kind", "bar")
+    full = bool(raw.get("full", False))
+    border = bool(raw.get("border", False))
+    if kind == "donut":
+        if len(metrics) != 1:
+            raise ConfigError(f"{where}: donut takes exactly one metric")
+        renderer = DonutRenderer(families, build_donut_style(full, border))
+    elif kind == "bar":
+        if len(metrics) not in BAR_LANES:
+            raise ConfigError(f"{where}: bar takes 1, 2 or 3 metrics (one per lane)")
+        width = raw.get("width", 8)
+        if not isinstance(width, int) or isinstance(width, bool) or width <= 0:
+            raise ConfigError(f"{where}: width must be a positive integer")
+        # Single-lane bars have no inter-lane gap, same as the CLI.
+        gapped = len(metrics) > 1 and bool(raw.get("gapped", False))
+        renderer = BarRenderer(families, len(metrics), width, build_bar_style(gapped, full, border))
+    else:
+        raise ConfigError(f"{where}: unknown kind: {kind}")
+    return Gauge(gauge_id, float(interval), metrics, renderer)
+
+
+class LineWriter:
+    """Writes whole lines to stdout or a FIFO.
+
+    A FIFO is opened non-blocking: while no reader is attached the newest
+    line is kept and delivered once one connects, and a reader that goes
+    away is simply waited for again. A reader that falls behind gets the
+    newest line once it drains the pipe. Lines shorter than PIPE_BUF are
+    written atomically, so readers never see a torn line.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.fd = None
+        self.pending = None
+
+    def write(self, line):
+        self.pending = line + "\n"
+        self.flush()
+
+    def flush(self):
+        if self.pending is None:
+            return
+        if self.path is None:
+            sys.stdout.write(self.pending)
+            sys.stdout.flush()
+            self.pending = None
+            return
+        if self.fd is None:
+            try:
+                self.fd = os.open(self.path, os.O_WRONLY | os.O_NONBLOCK)
+            except OSError as err:
+                if err.errno == errno.ENXIO:
+                    return  # no reader yet
+                raise
+        try:
+            os.write(self.fd, self.pending.encode("utf-8"))
+        except BlockingIOError:
+            return  # reader is behind; retried on the next tick
+        except BrokenPipeError:
+            os.close(self.fd)
+            self.fd = None
+            return
+        self.pending = None
+
+
+class Feed:
+    def __init__(self, gauges, line_format, separator, writer):
+        self.gauges = gauges
+        self.line_format = line_format
+        self.separator = separator
+        self.writer = writer
+        self.line = None
+
+    def compose(self):
+        texts = {g.id: g.text for g in self.gauges}
+        if self.line_format is None:
+            return self.separator.join(texts.values())
+        return self.line_format.format_map(texts)
+
+    def emit(self):
+        line = self.compose()
+        if line != self.line:
+            self.line = line
+            self.writer.write(line)
+        else:
+            self.writer.flush()
+
+    async def run_group(self, interval, gauges):
+        loop = asyncio.get_running_loop()
+        next_at = loop.time()
+        while True:
+            snap = ProcSnapshot()
+            now = time.monotonic()
+            changed = False
+            for gauge in gauges:
+                changed |= gauge.update(snap, now)
+            if changed or self.writer.pending is not None:
+                self.emit()
+            next_at += interval
+            delay = next_at - loop.time()
+            if delay < 0:
+                # Fell behind (suspend, overloaded host): resync instead of
+                # bursting through the missed ticks.
+                next_at = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+
+    async def run(self):
+        groups = {}
+        for gauge in self.gauges:
+            groups.setdefault(gauge.interval, []).append(gauge)
+        self.emit()
+        await asyncio.gather(*(self.run_group(interval, gauges) for interval, gauges in groups.items()))
+
+
+def load_feed(config_path, layout_path, output):
+    try:
+        config = json.loads(Path(config_path).read_text(encoding="utf-8"))
+    except json.JSONDecodeError as err:
+        raise ConfigError(f"{config_path}: {err}") from None
+    if not isinstance(config, dict):
+        raise ConfigError("config must be a JSON object")
+
+    families = load_layout(layout_path)
+    default_interval = config.get("interval", 1.0)
+    raw_gauges = config.get("gauges")
+    if not isinstance(raw_gauges, list) or not raw_gauges:
+        raise ConfigError("config needs a non-empty gauges list")
+    gauges = [parse_gauge(raw, i, families, default_interval) for i, raw in enumerate(raw_gauges)]
+    ids = [g.id for g in gauges]
+    if len(set(ids)) != len(ids):
+        raise ConfigError("gauge ids must be unique")
+
+    line_format = config.get("format")
+    if line_format is not None:
+        try:
+            line_format.format_map({gauge_id: "" for gauge_id in ids})
+        except (KeyError, IndexError, ValueError, AttributeError) as err:
+            raise ConfigError(f"bad format: {err}") from None
+
+    return Feed(gauges, line_format, config.get("separator", " "), LineWriter(output or config.get("output")))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive CellGauge status lines from /proc metrics.")
+    parser.add_argument("config", help="JSON gauge config (see docs/feed.md)")
+    parser.add_argument("--layout", default=DEFAULT_LAYOUT, help="glyph layout table (default: packaged)")
+    parser.add_argument("--output", help="FIFO to write lines to (default: config output, else stdout)")
+    args = parser.parse_args()
+
+    try:
+        feed = load_feed(args.config, args.layout, args.output)
+        asyncio.run(feed.run())
+    except (ConfigError, OSError) as err:
+        if isinstance(err, BrokenPipeError):
+            return 0
+        print(f"cellgauge-feed: {err}", file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        return 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,17 +2,26 @@
 """
 Align CellGauge chart glyphs to Menlo metrics and remap glyph cmap entries.
 
+Also writes the runtime glyph layout table (see glyph_layout.py) next to
+the font, with a .layout extension.
+
 Usage:
   python align_to_menlo_capheight.py <chart_font_ttf>
 """
 
+import array
+import math
 import re
 import sys
+
+import numpy as np
 from fontTools import subset
 from fontTools.pens.transformPen import TransformPen
 from fontTools.pens.ttGlyphPen import TTGlyphPen
 from fontTools.ttLib import TTFont, newTable
+from fontTools.ttLib.tables import ttProgram
 from fontTools.ttLib.tables._c_m_a_p import CmapSubtable
+from fontTools.ttLib.tables._g_l_y_f import Glyph, GlyphCoordinates, flagOnCurve
 
 LEVELS = 8
 STRIDE = LEVELS + 1
@@ -55,6 +64,8 @@ TMP_BAR2_BASE = 0x7000
 TMP_BAR3_BASE = 0x1000
 TMP_DONUT2_BASE = 0x7E20
 
+MENLO_PATH = "/System/Library/Fonts/Menlo.ttc"
+
 FONT_FAMILY = "CellGauge Symbols"
 FONT_SUBFAMILY = "Regular"
 FONT_FULL_NAME = f"{FONT_FAMILY} {FONT_SUBFAMILY}"
@@ -81,16 +92,100 @@ def set_post_format_3(ttfont):
     ttfont["post"].formatType = 3.0
 
 
+# flags byte -> on-curve bit only, as TTGlyphPen writes them.
+ON_CURVE_ONLY = bytes(f & flagOnCurve for f in range(256))
+
+
+def glyph_coordinates(points):
+    coords = GlyphCoordinates()
+    coords.array.frombytes(np.ascontiguousarray(points, dtype=np.float64).tobytes())
+    return coords
+
+
+def glyph_points(glyph):
+    return np.frombuffer(glyph.coordinates.array, dtype=np.float64).reshape(-1, 2)
+
+
+def transform_points(pts, t):
+    # t is one (xx, xy, yx, yy, dx, dy) row, or one row per point. Same
+    # evaluation order and otRound as TransformPen feeding TTGlyphPen.
+    t = np.asarray(t, dtype=np.float64).T
+    x, y = pts[:, 0], pts[:, 1]
+    out = np.empty_like(pts)
+    out[:, 0] = np.floor((x * t[0] + y * t[2]) + t[4] + 0.5)
+    out[:, 1] = np.floor((x * t[1] + y * t[3]) + t[5] + 0.5)
+    return out
+
+
+def simple_glyph(like, points):
+    """A simple glyph with like's contours and on-curve flags at points."""
+    glyph = Glyph()
+    glyph.numberOfContours = like.numberOfContours
+    glyph.endPtsOfContours = list(like.endPtsOfContours)
+    glyph.flags = array.array("B", bytes(like.flags).translate(ON_CURVE_ONLY))
+    glyph.coordinates = glyph_coordinates(points)
+    glyph.program = ttProgram.Program()
+    glyph.program.fromBytecode(b"")
+    return glyph
+
+
+def transform_simple_glyph(src, transform):
+    return simple_glyph(src, transform_points(glyph_points(src), transform))
+
+
 def apply_transform(glyf_table, glyph_name, transform):
     src = glyf_table[glyph_name]
+    if src.numberOfContours > 0:
+        glyf_table[glyph_name] = transform_simple_glyph(src, transform)
+        return
     pen = TTGlyphPen(glyf_table)
     tpen = TransformPen(pen, transform)
     src.draw(tpen, glyf_table)
     glyf_table[glyph_name] = pen.glyph()
 
 
+def apply_transforms(glyf_table, names, transforms):
+    """apply_transform over many glyphs in one vectorized pass.
+
+    transforms is a single affine tuple for every glyph, or one per name.
+    Every glyph comes back with its bounds set.
+    """
+    if isinstance(transforms, tuple):
+        transforms = [transforms] * len(names)
+    simple = []
+    for name, transform in zip(names, transforms):
+        if glyf_table[name].numberOfContours > 0:
+            simple.append((name, transform))
+        else:
+            apply_transform(glyf_table, name, transform)
+            recalc_bounds(glyf_table, name)
+    if not simple:
+        return
+
+    sources = [glyf_table[name] for name, _ in simple]
+    parts = [glyph_points(g) for g in sources]
+    counts = [len(p) for p in parts]
+    rows = np.repeat(np.asarray([t for _, t in simple], dtype=np.float64), counts, axis=0)
+    out = transform_points(np.concatenate(parts), rows)
+    starts = np.cumsum([0] + counts[:-1])
+    lo = np.floor(np.minimum.reduceat(out, starts) + 0.5).astype(int).tolist()
+    hi = np.floor(np.maximum.reduceat(out, starts) + 0.5).astype(int).tolist()
+    for i, ((name, _), src) in enumerate(zip(simple, sources)):
+        g = simple_glyph(src, out[starts[i] : starts[i] + counts[i]])
+        (g.xMin, g.yMin), (g.xMax, g.yMax) = lo[i], hi[i]
+        glyf_table[name] = g
+
+
 def recalc_bounds(glyf_table, glyph_name):
     g = glyf_table[glyph_name]
+    if g.numberOfContours > 0 and hasattr(g, "coordinates"):
+        # Glyph.recalcBounds without per-point calls: otRound of the
+        # control-point box.
+        c = g.coordinates.array
+        xs, ys = c[0::2], c[1::2]
+        g.xMin, g.yMin = math.floor(min(xs) + 0.5), math.floor(min(ys) + 0.5)
+        g.xMax, g.yMax = math.floor(max(xs) + 0.5), math.floor(max(ys) + 0.5)
+        return g
     g.recalcBounds(glyf_table)
     return g
 
@@ -311,21 +406,18 @@ def align_group(glyf, hmtx, names, info_by_name, target_y_min, target_h, target_
 
     sy = target_h / cur_h
     if family.startswith("bar"):
-        for name in names:
-            apply_transform(glyf, name, (1, 0, 0, sy, 0, 0))
+        apply_transforms(glyf, names, (1, 0, 0, sy, 0, 0))
     else:
         # Donuts must preserve circular shape; use uniform scaling.
-        for name in names:
-            apply_transform(glyf, name, (sy, 0, 0, sy, 0, 0))
+        apply_transforms(glyf, names, (sy, 0, 0, sy, 0, 0))
 
     ref = recalc_bounds(glyf, ref_name)
     dy = target_y_min - ref.yMin
+    apply_transforms(glyf, names, (1, 0, 0, 1, 0, dy))
     for name in names:
-        apply_transform(glyf, name, (1, 0, 0, 1, 0, dy))
         aw, _ = hmtx[name]
         if family.startswith("bar"):
-            g = recalc_bounds(glyf, name)
-            hmtx[name] = (aw, int(round(g.xMin)))
+            hmtx[name] = (aw, int(round(glyf[name].xMin)))
         else:
             hmtx[name] = (aw, 0)
 
@@ -337,10 +429,9 @@ def align_group(glyf, hmtx, names, info_by_name, target_y_min, target_h, target_
         ref_aw, _ = hmtx[ref_name]
         if ref_aw > 0:
             sx = target_aw / float(ref_aw)
+            apply_transforms(glyf, names, (sx, 0, 0, 1, 0, 0))
             for name in names:
-                apply_transform(glyf, name, (sx, 0, 0, 1, 0, 0))
-                g = recalc_bounds(glyf, name)
-                hmtx[name] = (int(round(target_aw)), int(round(g.xMin)))
+                hmtx[name] = (int(round(target_aw)), int(round(glyf[name].xMin)))
 
         # Increase x-span for join-bearing variants. The translation phase then
         # keeps left edges flush while allowing controlled right overhang.
@@ -352,16 +443,14 @@ def align_group(glyf, hmtx, names, info_by_name, target_y_min, target_h, target_
             desired_w = float(aw_i + bar_join_overlap)
             if rw > 0 and desired_w > 0:
                 stretch = max(stretch, desired_w / rw)
-        for name in names:
-            v = info_by_name[name]["variant"]
-            if v not in ("l", "m"):
-                continue
-            g = recalc_bounds(glyf, name)
-            if getattr(g, "numberOfContours", 0) == 0:
-                continue
-            apply_transform(glyf, name, (stretch, 0, 0, 1, 0, 0))
-            g = recalc_bounds(glyf, name)
-            hmtx[name] = (aw_i, int(round(g.xMin)))
+        joined = [
+            name
+            for name in names
+            if info_by_name[name]["variant"] in ("l", "m") and getattr(glyf[name], "numberOfContours", 0) != 0
+        ]
+        apply_transforms(glyf, joined, (stretch, 0, 0, 1, 0, 0))
+        for name in joined:
+            hmtx[name] = (aw_i, int(round(glyf[name].xMin)))
 
         rep_l = pick_representative(names, info_by_name, "l")
         rep_r = pick_representative(names, info_by_name, "r")
@@ -374,6 +463,8 @@ def align_group(glyf, hmtx, names, info_by_name, target_y_min, target_h, target_
             g = recalc_bounds(glyf, rep_r)
             right_pad = max(0, aw_i - int(round(g.xMax)))
 
+        moved = []
+        shifts = []
         for name in names:
             v = info_by_name[name]["variant"]
             g = recalc_bounds(glyf, name)
@@ -391,10 +482,12 @@ def align_group(glyf, hmtx, names, info_by_name, target_y_min, target_h, target_
                 dx = (aw_i - right_pad) - g.xMax
             else:  # s
                 dx = left_pad - g.xMin
+            moved.append(name)
+            shifts.append((1, 0, 0, 1, dx, 0))
 
-            apply_transform(glyf, name, (1, 0, 0, 1, dx, 0))
-            g = recalc_bounds(glyf, name)
-            hmtx[name] = (aw_i, int(round(g.xMin)))
+        apply_transforms(glyf, moved, shifts)
+        for name in moved:
+            hmtx[name] = (aw_i, int(round(glyf[name].xMin)))
         return
 
     # Donut: normalize horizontal size so full two-cell width ~= target height.
@@ -411,10 +504,11 @@ def align_group(glyf, hmtx, names, info_by_name, target_y_min, target_h, target_
         desired_half = target_h / 2.0
         if cur_half > 0 and desired_half > 0:
             sx = desired_half / cur_half
-            for name in names:
-                apply_transform(glyf, name, (sx, 0, 0, 1, 0, 0))
+            apply_transforms(glyf, names, (sx, 0, 0, 1, 0, 0))
 
     # donut2: translate only (no x-scaling) so tiny segments don't stretch.
+    moved = []
+    shifts = []
     for name in names:
         g = recalc_bounds(glyf, name)
         if getattr(g, "numberOfContours", 0) == 0:
@@ -427,39 +521,30 @@ def align_group(glyf, hmtx, names, info_by_name, target_y_min, target_h, target_
         else:  # r
             # Right-bleed strategy: no left overhang on the right-half glyph.
             dx = -g.xMin
+        moved.append(name)
+        shifts.append((1, 0, 0, 1, dx, 0))
 
-        apply_transform(glyf, name, (1, 0, 0, 1, dx, 0))
-        g = recalc_bounds(glyf, name)
-        hmtx[name] = (aw_i, int(round(g.xMin)))
+    apply_transforms(glyf, moved, shifts)
+    for name in moved:
+        hmtx[name] = (aw_i, int(round(glyf[name].xMin)))
 
 
-def main():
-    if len(sys.argv) != 2:
-        print("usage: align_to_menlo_capheight.py <icon_font_ttf>", file=sys.stderr)
-        return 2
-
-    icon_path = sys.argv[1]
-    menlo_path = "/System/Library/Fonts/Menlo.ttc"
-    icon_font = TTFont(icon_path)
+def menlo_targets(icon_upm, menlo_path=MENLO_PATH):
+    """Cap-height, full-block and advance targets in icon units, or None."""
     menlo_font = TTFont(menlo_path, fontNumber=0)
-
     menlo_glyf = menlo_font["glyf"]
     menlo_cmap = menlo_font["cmap"].getBestCmap()
     menlo_h_name = menlo_cmap.get(ord("H"))
     if not menlo_h_name:
-        print("Menlo 'H' glyph not found", file=sys.stderr)
-        return 1
+        return None
 
     menlo_h = menlo_glyf[menlo_h_name]
     menlo_h.recalcBounds(menlo_glyf)
     menlo_advance, _ = menlo_font["hmtx"][menlo_h_name]
-
-    icon_upm = float(icon_font["head"].unitsPerEm)
     menlo_upm = float(menlo_font["head"].unitsPerEm)
 
     h_y_min = (menlo_h.yMin / menlo_upm) * icon_upm
     h_y_max = (menlo_h.yMax / menlo_upm) * icon_upm
-    h_target_h = h_y_max - h_y_min
 
     menlo_block_name = menlo_cmap.get(0x2588)
     if menlo_block_name:
@@ -470,7 +555,41 @@ def main():
     else:
         full_y_min = h_y_min
         full_y_max = h_y_max
-    full_target_h = full_y_max - full_y_min
+
+    return {
+        "h_y_min": h_y_min,
+        "h_y_max": h_y_max,
+        "full_y_min": full_y_min,
+        "full_y_max": full_y_max,
+        "advance": (float(menlo_advance) / menlo_upm) * icon_upm,
+    }
+
+
+def align_styled_group(glyf, hmtx, names, info_by_name, targets, family, style):
+    if family.startswith("bar"):
+        is_full = style[1] == "f"
+    else:
+        is_full = style[0] == "f"
+
+    if is_full:
+        y_min, y_max = targets["full_y_min"], targets["full_y_max"]
+    else:
+        y_min, y_max = targets["h_y_min"], targets["h_y_max"]
+    align_group(glyf, hmtx, names, info_by_name, y_min, y_max - y_min, targets["advance"], family)
+
+
+def main():
+    if len(sys.argv) != 2:
+        print("usage: align_to_menlo_capheight.py <icon_font_ttf>", file=sys.stderr)
+        return 2
+
+    icon_path = sys.argv[1]
+    icon_font = TTFont(icon_path)
+    targets = menlo_targets(float(icon_font["head"].unitsPerEm))
+    if not targets:
+        print("Menlo 'H' glyph not found", file=sys.stderr)
+        return 1
+    h_y_max = targets["h_y_max"]
 
     os2 = icon_font["OS/2"]
     if hasattr(os2, "sCapHeight"):
@@ -491,23 +610,11 @@ def main():
         if info:
             info_by_name[name] = info
 
-    shape_names = list(info_by_name.keys())
-    if shape_names:
-        target_aw = (float(menlo_advance) / menlo_upm) * icon_upm
-        grouped = {}
-        for name, info in info_by_name.items():
-            grouped.setdefault((info["family"], info["style"]), []).append(name)
-
-        for (family, style), names in grouped.items():
-            if family == "donut2":
-                is_full = style[0] == "f"
-            else:
-                is_full = style[1] == "f"
-
-            if is_full:
-                align_group(glyf, hmtx, names, info_by_name, full_y_min, full_target_h, target_aw, family)
-            else:
-                align_group(glyf, hmtx, names, info_by_name, h_y_min, h_target_h, target_aw, family)
+    grouped = {}
+    for name, info in info_by_name.items():
+        grouped.setdefault((info["family"], info["style"]), []).append(name)
+    for (family, style), names in grouped.items():
+        align_styled_group(glyf, hmtx, names, info_by_name, targets, family, style)
 
     full_cmap = {}
     for cp, gname in old_cmap.items():
@@ -544,6 +651,11 @@ def main():
 
     icon_font.save(icon_path)
 
+    # Imported here: glyph_layout depends on this module's constants.
+    from glyph_layout import layout_path_for, write_layout
+
+    write_layout(icon_font["cmap"].getBestCmap() or {}, layout_path_for(icon_path))
+
     return 0
 
 
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Check what every glyph of the built font looks like against golden hashes.
+
+Every encoded glyph is rasterized onto a terminal-cell grid at a fixed ppem
+(see rasterize.py) and its coverage bitmap is hashed. The hashes are compared
+with a stored manifest keyed by codepoint, and changed, missing and new
+glyphs are listed grouped by family and style. Rasterization is spread over
+worker processes.
+
+Rows are snapped per glyph rather than per (family, style) group, so a change
+to one glyph only changes that glyph's hash.
+
+After an intended change to glyph geometry, review the diff (render single
+glyphs with rasterize.py) and rewrite the manifest with --update.
+
+Usage:
+  python check_golden.py <chart_font_ttf> [--manifest PATH] [--update]
+                         [--jobs N] [--show N]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from multiprocessing import Pool
+
+from fontTools.ttLib import TTFont
+
+from glyph_layout import info_for_codepoint
+from rasterize import DEFAULT_OVERSAMPLE, GlyphRasterizer
+
+DEFAULT_MANIFEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden_hashes.json")
+PPEM = 16
+DEPTH = 8
+HASH_CHARS = 12
+DEFAULT_SHOW = 4
+CHUNK_SIZE = 128
+
+# Worker-process rasterizer, loaded once per worker by init_worker().
+_raster = None
+
+
+def init_worker(font_path):
+    global _raster
+    _raster = GlyphRasterizer(TTFont(font_path), group_snap=False)
+
+
+def hash_glyph(name):
+    levels = _raster.levels(name, PPEM, DEPTH)
+    digest = hashlib.sha1(repr(levels.shape).encode("ascii") + levels.tobytes()).hexdigest()
+    return name, digest[:HASH_CHARS]
+
+
+def glyph_hashes(font_path, jobs):
+    """Codepoint -> bitmap hash for every encoded glyph."""
+    cmap = TTFont(font_path).getBestCmap()
+    names = sorted(set(cmap.values()))
+    if jobs == 1:
+        init_worker(font_path)
+        by_name = dict(map(hash_glyph, names))
+    else:
+        with Pool(jobs, initializer=init_worker, initargs=(font_path,)) as pool:
+            by_name = dict(pool.imap_unordered(hash_glyph, names, chunksize=CHUNK_SIZE))
+    return {cp: by_name[name] for cp, name in cmap.items()}, len(by_name)
+
+
+def manifest_params():
+    return {"ppem": PPEM, "depth": DEPTH, "oversample": DEFAULT_OVERSAMPLE}
+
+
+def write_manifest(path, hashes):
+    lines = [f'    "{cp:06X}": "{digest}"' for cp, digest in sorted(hashes.items())]
+    params = json.dumps(manifest_params(), sort_keys=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f'{{\n  "params": {params},\n  "glyphs": {{\n' + ",\n".join(lines) + "\n  }\n}\n")
+
+
+def read_manifest(path):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data["params"] != manifest_params():
+        raise SystemExit(f"{path} was made with {data['params']}, expected {manifest_params()}; rerun with --update")
+    return {int(cp, 16): digest for cp, digest in data["glyphs"].items()}
+
+
+def group_label(cp):
+    info = info_for_codepoint(cp)
+    if not info:
+        return "other", f"U+{cp:06X}"
+    family, style, variant, levels = info
+    return f"{family} {style}", f"U+{cp:06X} {variant} {''.join(map(str, levels))}"
+
+
+def diff(golden, current):
+    """(family style) -> {kind: [glyph labels]} for every differing codepoint."""
+    groups = {}
+    for cp in sorted(set(golden) | set(current)):
+        if cp not in current:
+            kind = "missing"
+        elif cp not in golden:
+            kind = "new"
+        elif golden[cp] != current[cp]:
+            kind = "changed"
+        else:
+            continue
+        group, label = group_label(cp)
+        groups.setdefault(group, {}).setdefault(kind, []).append(label)
+    return groups
+
+
+def print_diff(groups, show):
+    for group in sorted(groups):
+        kinds = groups[group]
+        counts = ", ".join(f"{len(kinds[k])} {k}" for k in ("changed", "missing", "new") if k in kinds)
+        print(f"{group:<12} {counts}")
+        for kind in ("changed", "missing", "new"):
+            labels = kinds.get(kind, [])
+            if show and labels:
+                more = f" (+{len(labels) - show} more)" if len(labels) > show else ""
+                print(f"  {kind}: {', '.join(labels[:show])}{more}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("font", help="built CellGaugeSymbols.ttf")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST, help="golden hash manifest")
+    parser.add_argument("--update", action="store_true", help="rewrite the manifest from this font")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--show", type=int, default=DEFAULT_SHOW, help="glyphs listed per group and kind")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    hashes, unique = glyph_hashes(args.font, max(1, args.jobs))
+    elapsed = time.perf_counter() - started
+    print(
+        f"rasterized {len(hashes)} codepoints ({unique} glyphs) at {PPEM} ppem "
+        f"with {max(1, args.jobs)} workers in {elapsed:.1f}s"
+    )
+
+    if args.update:
+        write_manifest(args.manifest, hashes)
+        print(args.manifest)
+        return 0
+
+    groups = diff(read_manifest(args.manifest), hashes)
+    if not groups:
+        print(f"all glyphs match {args.manifest}")
+        return 0
+    print_diff(groups, args.show)
+    total = sum(len(v) for kinds in groups.values() for v in kinds.values())
+    print(f"{total} glyphs differ from {args.manifest}")
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
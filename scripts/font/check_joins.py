@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Validate adjacent-cell joins in the built CellGauge font.
+
+Every pair of neighbouring cells that the runtime renderer can emit is
+checked in one vectorized pass over the final glyph bounds:
+
+  bars:   l|m, l|r, m|m, m|r for every reachable lane-level transition
+  donuts: l|r for every level
+
+Usage:
+  python check_joins.py <chart_font_ttf> [--tolerance UNITS] [--limit N]
+"""
+
+import argparse
+import time
+
+import numpy as np
+from fontTools.ttLib import TTFont
+
+from align_to_menlo_capheight import (
+    BAR1_BASE,
+    BAR1_STRIDE,
+    BAR1_STYLE_BLOCK,
+    BAR2_BASE,
+    BAR2_STYLE_BLOCK,
+    BAR3_BASE,
+    BAR3_STYLE_BLOCK,
+    BAR_JOIN_OVERLAP_RATIO,
+    BAR_STYLE_IDS,
+    BAR_VARIANT_INDEX,
+    BAR_VARIANTS,
+    DONUT2_BASE,
+    DONUT2_STYLE_BLOCK,
+    DONUT_JOIN_OVERLAP_RATIO,
+    DONUT_LEVELS,
+    DONUT_SIDE_INDEX,
+    DONUT_STATES,
+    DONUT_STYLES,
+    STRIDE,
+)
+
+PLANE_BASE = 0x100000
+PLANE_SIZE = 0x10000
+
+BAR_FAMILIES = (
+    # family, lanes, base, stride, style block
+    ("bar1", 1, BAR1_BASE, BAR1_STRIDE, BAR1_STYLE_BLOCK),
+    ("bar2", 2, BAR2_BASE, STRIDE, BAR2_STYLE_BLOCK),
+    ("bar3", 3, BAR3_BASE, STRIDE, BAR3_STYLE_BLOCK),
+)
+
+# Positional variant pairs the renderer emits for widths >= 2.
+BAR_VARIANT_PAIRS = (("l", "m"), ("l", "r"), ("m", "m"), ("m", "r"))
+
+
+class GlyphBounds:
+    """Dense per-codepoint bounds for the Plane-16 chart block."""
+
+    def __init__(self, ttfont):
+        self.present = np.zeros(PLANE_SIZE, dtype=bool)
+        self.empty = np.zeros(PLANE_SIZE, dtype=bool)
+        self.x_min = np.zeros(PLANE_SIZE, dtype=np.int32)
+        self.x_max = np.zeros(PLANE_SIZE, dtype=np.int32)
+        self.y_min = np.zeros(PLANE_SIZE, dtype=np.int32)
+        self.y_max = np.zeros(PLANE_SIZE, dtype=np.int32)
+        self.advance = np.zeros(PLANE_SIZE, dtype=np.int32)
+
+        glyf = ttfont["glyf"]
+        hmtx = ttfont["hmtx"]
+        bounds_by_name = {}
+        for cp, name in (ttfont["cmap"].getBestCmap() or {}).items():
+            if not PLANE_BASE <= cp < PLANE_BASE + PLANE_SIZE:
+                continue
+            if name not in bounds_by_name:
+                g = glyf[name]
+                if getattr(g, "numberOfContours", 0) == 0:
+                    bounds_by_name[name] = None
+                else:
+                    g.recalcBounds(glyf)
+                    bounds_by_name[name] = (g.xMin, g.xMax, g.yMin, g.yMax)
+            i = cp - PLANE_BASE
+            self.present[i] = True
+            self.advance[i] = hmtx[name][0]
+            bounds = bounds_by_name[name]
+            if bounds is None:
+                self.empty[i] = True
+            else:
+                self.x_min[i], self.x_max[i], self.y_min[i], self.y_max[i] = bounds
+
+
+class PairSet:
+    """Columnar list of adjacent (left, right) codepoint pairs."""
+
+    def __init__(self):
+        self.columns = {
+            "family": [],
+            "style": [],
+            "left_variant": [],
+            "right_variant": [],
+            "left_state": [],
+            "right_state": [],
+            "left_cp": [],
+            "right_cp": [],
+            "bordered": [],
+            "needs_join": [],
+            "ratio": [],
+        }
+
+    def add(self, count, **cols):
+        for key, values in cols.items():
+            self.columns[key].append(np.broadcast_to(values, (count,)))
+
+    def arrays(self):
+        return {key: np.concatenate(parts) for key, parts in self.columns.items()}
+
+
+def lane_transitions(levels):
+    # Levels of one lane in cell i and cell i+1.  A lane can only continue
+    # into the next cell once it has saturated the current one.
+    out = [(a, 0) for a in range(levels + 1)]
+    out.extend((levels, b) for b in range(1, levels + 1))
+    return np.array(out, dtype=np.int32)
+
+
+def collect_bar_pairs(pairs, families):
+    for family_idx, (family, lanes, base, stride, style_block) in enumerate(families):
+        levels = stride - 1
+        transitions = lane_transitions(levels)
+        combos = np.indices((len(transitions),) * lanes).reshape(lanes, -1).T
+        left_levels = transitions[combos, 0]
+        right_levels = transitions[combos, 1]
+        weights = stride ** np.arange(lanes - 1, -1, -1, dtype=np.int32)
+        left_state = left_levels @ weights
+        right_state = right_levels @ weights
+        left_all_filled = (left_levels > 0).all(axis=1)
+        left_all_empty = (left_levels == 0).all(axis=1)
+        right_all_empty = (right_levels == 0).all(axis=1)
+        lane_continues = ((left_levels == levels) & (right_levels > 0)).any(axis=1)
+        variant_block = style_block // len(BAR_VARIANTS)
+
+        for style_idx, style in enumerate(BAR_STYLE_IDS):
+            # Single-lane gapped styles are never emitted by the renderer.
+            if lanes == 1 and style.startswith("g"):
+                continue
+            bordered = not style.endswith("n")
+            style_base = base + style_idx * style_block
+            if bordered:
+                variant_pairs = BAR_VARIANT_PAIRS
+                keep = np.ones(len(combos), dtype=bool)
+            else:
+                # No-border styles use "m" for every cell and render empty
+                # cells as plain spaces, which never join.
+                variant_pairs = (("m", "m"),)
+                keep = ~(left_all_empty | right_all_empty)
+
+            for left_variant, right_variant in variant_pairs:
+                left_idx = np.full(len(combos), BAR_VARIANT_INDEX[left_variant], dtype=np.int32)
+                if left_variant == "l":
+                    # Mirror the renderer's redirect of hidden left caps.
+                    left_idx[left_all_filled] = BAR_VARIANT_INDEX["m"]
+                right_idx = BAR_VARIANT_INDEX[right_variant]
+                n = int(keep.sum())
+                pairs.add(
+                    n,
+                    family=family_idx,
+                    style=style_idx,
+                    left_variant=left_idx[keep],
+                    right_variant=right_idx,
+                    left_state=left_state[keep],
+                    right_state=right_state[keep],
+                    left_cp=(style_base + left_idx * variant_block + left_state)[keep],
+                    right_cp=style_base + right_idx * variant_block + right_state[keep],
+                    bordered=bordered,
+                    needs_join=(bordered | lane_continues)[keep],
+                    ratio=BAR_JOIN_OVERLAP_RATIO,
+                )
+
+
+def collect_donut_pairs(pairs, family_idx):
+    all_levels = np.arange(DONUT_LEVELS + 1, dtype=np.int32)
+    for style_idx, style in enumerate(DONUT_STYLES):
+        bordered = style.endswith("b")
+        # No-border empty donuts render as two spaces.
+        levels = all_levels if bordered else all_levels[1:]
+        style_base = DONUT2_BASE + style_idx * DONUT2_STYLE_BLOCK
+        pairs.add(
+            len(levels),
+            family=family_idx,
+            style=style_idx,
+            left_variant=DONUT_SIDE_INDEX["l"],
+            right_variant=DONUT_SIDE_INDEX["r"],
+            left_state=levels,
+            right_state=levels,
+            left_cp=style_base + DONUT_SIDE_INDEX["l"] * DONUT_STATES + levels,
+            right_cp=style_base + DONUT_SIDE_INDEX["r"] * DONUT_STATES + levels,
+            bordered=bordered,
+            needs_join=True,
+            ratio=DONUT_JOIN_OVERLAP_RATIO,
+        )
+
+
+def style_envelopes(cols, bounds, group_key):
+    # Vertical extent of every (family, style) group, used to check
+    # no-border glyphs whose lanes legitimately differ in height.
+    left = cols["left_cp"] - PLANE_BASE
+    right = cols["right_cp"] - PLANE_BASE
+    ok = bounds.present[left] & bounds.present[right] & ~bounds.empty[left] & ~bounds.empty[right]
+    groups = group_key[ok]
+    y_lo = np.minimum(bounds.y_min[left], bounds.y_min[right])[ok]
+    y_hi = np.maximum(bounds.y_max[left], bounds.y_max[right])[ok]
+    env_min = np.full(group_key.max() + 1, np.iinfo(np.int32).max, dtype=np.int32)
+    env_max = np.full(group_key.max() + 1, np.iinfo(np.int32).min, dtype=np.int32)
+    np.minimum.at(env_min, groups, y_lo)
+    np.maximum.at(env_max, groups, y_hi)
+    return env_min[group_key], env_max[group_key]
+
+
+def validate(bounds, cols, tolerance):
+    left = cols["left_cp"] - PLANE_BASE
+    right = cols["right_cp"] - PLANE_BASE
+    missing = ~bounds.present[left] | ~bounds.present[right]
+
+    inked = ~missing & ~bounds.empty[left] & ~bounds.empty[right]
+    checked = inked & cols["needs_join"]
+
+    intended = np.maximum(1, np.rint(bounds.advance[left] * cols["ratio"])).astype(np.int32)
+    overlap = bounds.x_max[left] - bounds.advance[left] - bounds.x_min[right]
+    bad_overlap = checked & ((overlap <= 0) | (np.abs(overlap - intended) > tolerance))
+
+    group_key = cols["family"] * 16 + cols["style"]
+    env_min, env_max = style_envelopes(cols, bounds, group_key)
+    dy_min = np.abs(bounds.y_min[left] - bounds.y_min[right])
+    dy_max = np.abs(bounds.y_max[left] - bounds.y_max[right])
+    misaligned_bordered = cols["bordered"] & ((dy_min > tolerance) | (dy_max > tolerance))
+    outside_envelope = (
+        (np.minimum(bounds.y_min[left], bounds.y_min[right]) < env_min - tolerance)
+        | (np.maximum(bounds.y_max[left], bounds.y_max[right]) > env_max + tolerance)
+    )
+    bad_vertical = checked & (misaligned_bordered | outside_envelope)
+
+    return {
+        "missing": missing,
+        "overlap": bad_overlap,
+        "vertical": bad_vertical,
+        "checked": checked,
+        "overlap_units": overlap,
+        "intended_units": intended,
+        "dy_min": dy_min,
+        "dy_max": dy_max,
+    }
+
+
+def describe_pair(cols, i, family_names):
+    family = family_names[cols["family"][i]]
+    if family == "donut2":
+        style = DONUT_STYLES[cols["style"][i]]
+        return f"{family} {style} l|r {int(cols['left_state'][i]):02d}"
+    style = BAR_STYLE_IDS[cols["style"][i]]
+    lv = BAR_VARIANTS[cols["left_variant"][i]]
+    rv = BAR_VARIANTS[cols["right_variant"][i]]
+    return (
+        f"{family} {style} {lv}|{rv} "
+        f"U+{int(cols['left_cp'][i]):06X}|U+{int(cols['right_cp'][i]):06X}"
+    )
+
+
+def report(cols, result, family_names, limit):
+    failures = 0
+    for kind in ("missing", "overlap", "vertical"):
+        idx = np.flatnonzero(result[kind])
+        if idx.size == 0:
+            continue
+        failures += idx.size
+        print(f"{kind}: {idx.size} pair(s)")
+        for i in idx[:limit]:
+            line = f"  {describe_pair(cols, i, family_names)}"
+            if kind == "overlap":
+                line += f": overlap {int(result['overlap_units'][i])} (want {int(result['intended_units'][i])})"
+            elif kind == "vertical":
+                line += f": dy {int(result['dy_min'][i])}/{int(result['dy_max'][i])}"
+            print(line)
+        if idx.size > limit:
+            print(f"  ... {idx.size - limit} more")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("font", help="built CellGaugeSymbols.ttf")
+    parser.add_argument(
+        "--tolerance",
+        type=int,
+        default=2,
+        help="allowed deviation from the intended overlap / alignment, in font units",
+    )
+    parser.add_argument("--limit", type=int, default=10, help="examples printed per failure kind")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    bounds = GlyphBounds(TTFont(args.font))
+
+    family_names = [f[0] for f in BAR_FAMILIES] + ["donut2"]
+    pairs = PairSet()
+    collect_bar_pairs(pairs, BAR_FAMILIES)
+    collect_donut_pairs(pairs, family_names.index("donut2"))
+    cols = pairs.arrays()
+
+    result = validate(bounds, cols, args.tolerance)
+    failures = report(cols, result, family_names, args.limit)
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"checked {int(result['checked'].sum())} joins "
+        f"({len(cols['left_cp'])} pairs) in {elapsed:.2f}s: "
+        f"{'ok' if failures == 0 else f'{failures} problem(s)'}"
+    )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Embed pre-rasterized bitmap strikes (EBLC/EBDT) into the built font.
+
+Terminals that find a strike for the requested ppem blit the stored bitmap
+instead of rasterizing the outline. Every chart glyph is one cell-sized
+bitmap, so each strike uses a single constant-metrics index subtable
+(index format 5) over bit-aligned image data (image format 5).
+
+Rasterization (cell-edge and lane snapping) is done by rasterize.py.
+
+Usage:
+  python embed_bitmaps.py <chart_font_ttf> [--ppem 12-24] [--depth BITS] [--output PATH]
+"""
+
+import argparse
+import io
+import time
+
+from fontTools.ttLib import TTFont, newTable
+from fontTools.ttLib.tables.BitmapGlyphMetrics import BigGlyphMetrics
+from fontTools.ttLib.tables.E_B_D_T_ import ebdt_bitmap_format_5
+from fontTools.ttLib.tables.E_B_L_C_ import BitmapSizeTable, SbitLineMetrics, Strike, eblc_index_sub_table_5
+
+from rasterize import BIT_DEPTHS, GlyphRasterizer, pack_bits
+
+DEFAULT_PPEMS = "12-24"
+DEFAULT_DEPTH = 4
+
+
+def parse_ppems(spec):
+    ppems = set()
+    for part in spec.split(","):
+        lo, _, hi = part.strip().partition("-")
+        lo, hi = int(lo), int(hi or lo)
+        if not 1 <= lo <= hi <= 255:
+            raise argparse.ArgumentTypeError(f"bad ppem range: {part}")
+        ppems.update(range(lo, hi + 1))
+    return sorted(ppems)
+
+
+def line_metrics(grid):
+    m = SbitLineMetrics()
+    m.ascender = grid.top
+    m.descender = grid.bottom
+    m.widthMax = grid.width
+    m.caretSlopeNumerator = 0
+    m.caretSlopeDenominator = 1
+    m.caretOffset = 0
+    m.minOriginSB = 0
+    m.minAdvanceSB = 0
+    m.maxBeforeBL = grid.top
+    m.minAfterBL = grid.bottom
+    m.pad1 = 0
+    m.pad2 = 0
+    return m
+
+
+def glyph_metrics(grid):
+    m = BigGlyphMetrics()
+    m.height = grid.height
+    m.width = grid.width
+    m.horiBearingX = 0
+    m.horiBearingY = grid.top
+    m.horiAdvance = grid.width
+    m.vertBearingX = -(grid.width // 2)
+    m.vertBearingY = 0
+    m.vertAdvance = grid.height
+    return m
+
+
+def build_strike(raster, names, ppem, depth):
+    grid = raster.grid(ppem)
+    if grid.width > 255 or grid.height > 255 or grid.top > 127 or grid.bottom < -128:
+        raise ValueError(f"ppem {ppem} is too large for EBLC metrics")
+
+    image_size = (grid.width * grid.height * depth + 7) // 8
+    glyphs = {}
+    for name in names:
+        glyph = ebdt_bitmap_format_5(None, None)
+        del glyph.data
+        glyph.imageData = pack_bits(raster.levels(name, ppem, depth), depth)
+        glyphs[name] = glyph
+
+    table = BitmapSizeTable()
+    table.hori = line_metrics(grid)
+    table.vert = line_metrics(grid)
+    table.colorRef = 0
+    table.ppemX = ppem
+    table.ppemY = ppem
+    table.bitDepth = depth
+    table.flags = 1  # horizontal metrics
+
+    sub = eblc_index_sub_table_5(None, None)
+    del sub.data, sub.ttFont
+    sub.indexFormat = 5
+    sub.imageFormat = 5
+    sub.imageSize = image_size
+    sub.metrics = glyph_metrics(grid)
+    sub.names = list(names)
+
+    strike = Strike()
+    strike.bitmapSizeTable = table
+    strike.indexSubTables = [sub]
+    return strike, glyphs, grid, image_size
+
+
+def compiled_size(ttfont, tag):
+    return len(ttfont[tag].compile(ttfont))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("font", help="built CellGaugeSymbols.ttf")
+    parser.add_argument("--ppem", type=parse_ppems, default=parse_ppems(DEFAULT_PPEMS), help="sizes, e.g. 12-24 or 13,16")
+    parser.add_argument("--depth", type=int, choices=BIT_DEPTHS, default=DEFAULT_DEPTH, help="bits per pixel")
+    parser.add_argument("--output", help="output font (default: rewrite the input)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    font = TTFont(args.font)
+    for tag in ("EBLC", "EBDT", "EBSC"):
+        if tag in font:
+            del font[tag]
+    before = io.BytesIO()
+    font.save(before)
+
+    raster = GlyphRasterizer(font)
+    gid = {name: i for i, name in enumerate(font.getGlyphOrder())}
+    names = sorted(set(font.getBestCmap().values()), key=gid.__getitem__)
+
+    eblc = newTable("EBLC")
+    eblc.version = 2.0
+    eblc.strikes = []
+    ebdt = newTable("EBDT")
+    ebdt.version = 2.0
+    ebdt.strikeData = []
+    rows = []
+    for ppem in args.ppem:
+        strike, glyphs, grid, image_size = build_strike(raster, names, ppem, args.depth)
+        eblc.strikes.append(strike)
+        ebdt.strikeData.append(glyphs)
+        rows.append((ppem, grid, image_size * len(names)))
+    font["EBLC"] = eblc
+    font["EBDT"] = ebdt
+
+    after = io.BytesIO()
+    font.save(after)
+    out_path = args.output or args.font
+    with open(out_path, "wb") as f:
+        f.write(after.getvalue())
+
+    index_bytes = compiled_size(font, "EBLC")
+    print(f"{'ppem':>4}  {'cell':>7}  {'glyphs':>6}  {'bitmap bytes':>12}")
+    for ppem, grid, data_bytes in rows:
+        print(f"{ppem:>4}  {grid.width:>3}x{grid.height:<3}  {len(names):>6}  {data_bytes:>12}")
+    total = len(after.getvalue()) - len(before.getvalue())
+    print(
+        f"{len(rows)} strikes at {args.depth} bpp: EBDT {compiled_size(font, 'EBDT')} bytes, "
+        f"EBLC {index_bytes} bytes; font {len(before.getvalue())} -> {len(after.getvalue())} bytes "
+        f"(+{total}) in {time.perf_counter() - started:.1f}s"
+    )
+    print(out_path)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
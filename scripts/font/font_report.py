@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Report where the bytes of the built CellGauge font go.
+
+Every encoded glyph is joined back to its family, style, variant and lane
+levels (the inverse of codepoint_for_info), and its points, contours and
+encoded glyf bytes are summed per family, style and variant. Per-table
+sizes and the individual cmap subtables are listed as well.
+
+The JSON output is stable (sorted keys, no timestamps) so two builds can be
+diffed directly, or compared with --compare.
+
+Usage:
+  python font_report.py <chart_font_ttf> [--json OUT] [--glyphs] [--top N]
+                        [--compare OLD_JSON]
+"""
+
+import argparse
+import json
+import os
+
+from fontTools.ttLib import TTFont
+
+from align_to_menlo_capheight import codepoint_for_info
+from glyph_layout import info_for_codepoint
+
+GROUP_LEVELS = ("family", "style", "variant")
+OTHER = "other"
+
+
+def glyph_stats(font):
+    """Per-glyph points, contours and encoded bytes, keyed by glyph name."""
+    glyf = font["glyf"]
+    loca = font["loca"]
+    order = font.getGlyphOrder()
+    stats = {}
+    for gid, name in enumerate(order):
+        glyph = glyf[name]
+        if glyph.isComposite():
+            coords, _, _ = glyph.getCoordinates(glyf)
+            contours = sum(glyf[c.glyphName].numberOfContours for c in glyph.components)
+        else:
+            coords = glyph.coordinates if glyph.numberOfContours > 0 else []
+            contours = max(glyph.numberOfContours, 0)
+        stats[name] = {
+            "points": len(coords),
+            "contours": contours,
+            "bytes": loca[gid + 1] - loca[gid],
+        }
+    return stats
+
+
+def classify(font):
+    """Glyph name -> (codepoint, info dict or None) for encoded glyphs."""
+    out = {}
+    for cp, name in sorted(font.getBestCmap().items()):
+        found = info_for_codepoint(cp)
+        info = None
+        if found:
+            family, style, variant, levels = found
+            info = {"family": family, "style": style, "variant": variant, "levels": levels}
+            if codepoint_for_info(info) != cp:
+                raise SystemExit(f"codepoint mapping mismatch at U+{cp:X}: {info}")
+        out.setdefault(name, (cp, info))
+    return out
+
+
+def empty_totals():
+    return {"glyphs": 0, "points": 0, "contours": 0, "bytes": 0}
+
+
+def aggregate(stats, classified):
+    groups = {}
+    for name, s in stats.items():
+        _, info = classified.get(name, (None, None))
+        parts = [info[k] for k in GROUP_LEVELS] if info else [OTHER]
+        for depth in range(1, len(parts) + 1):
+            totals = groups.setdefault("/".join(parts[:depth]), empty_totals())
+            totals["glyphs"] += 1
+            for key in ("points", "contours", "bytes"):
+                totals[key] += s[key]
+    return groups
+
+
+def table_sizes(font):
+    return {tag: entry.length for tag, entry in sorted(font.reader.tables.items())}
+
+
+def cmap_subtables(font):
+    out = []
+    for st in font["cmap"].tables:
+        out.append(
+            {
+                "platform": st.platformID,
+                "encoding": st.platEncID,
+                "format": st.format,
+                "mappings": len(st.cmap),
+                "bytes": len(st.compile(font)),
+            }
+        )
+    return out
+
+
+def build_report(path, with_glyphs):
+    font = TTFont(path)
+    stats = glyph_stats(font)
+    classified = classify(font)
+    report = {
+        "file_bytes": os.path.getsize(path),
+        "glyph_count": len(stats),
+        "tables": table_sizes(font),
+        "cmap": cmap_subtables(font),
+        "groups": aggregate(stats, classified),
+    }
+    if with_glyphs:
+        glyphs = {}
+        for name, (cp, info) in classified.items():
+            entry = dict(stats[name], name=name)
+            if info:
+                entry.update(info, levels=list(info["levels"]))
+            glyphs[f"{cp:06X}"] = entry
+        report["glyphs"] = glyphs
+    return report, stats, classified
+
+
+def fmt_row(label, totals, indent=0):
+    avg = totals["bytes"] / totals["glyphs"] if totals["glyphs"] else 0
+    return (
+        f"{'  ' * indent + label:<22} {totals['glyphs']:>7} {totals['points']:>9} "
+        f"{totals['contours']:>8} {totals['bytes']:>10} {avg:>8.1f}"
+    )
+
+
+def print_report(report, stats, classified, top):
+    print(f"file: {report['file_bytes']} bytes, {report['glyph_count']} glyphs")
+    print()
+    print(f"{'table':<6} {'bytes':>10} {'share':>7}")
+    for tag, size in sorted(report["tables"].items(), key=lambda kv: -kv[1]):
+        print(f"{tag:<6} {size:>10} {size / report['file_bytes']:>7.1%}")
+    print()
+    print("cmap subtables:")
+    for st in report["cmap"]:
+        print(
+            f"  platform {st['platform']} encoding {st['encoding']} format {st['format']:<2} "
+            f"{st['mappings']:>6} mappings {st['bytes']:>8} bytes"
+        )
+    print()
+    print(f"{'group':<22} {'glyphs':>7} {'points':>9} {'contours':>8} {'glyf bytes':>10} {'avg':>8}")
+    groups = report["groups"]
+    families = sorted((k for k in groups if "/" not in k), key=lambda k: -groups[k]["bytes"])
+    for family in families:
+        print(fmt_row(family, groups[family]))
+        styles = sorted(
+            (k for k in groups if k.startswith(family + "/") and k.count("/") == 1),
+            key=lambda k: -groups[k]["bytes"],
+        )
+        for style in styles:
+            print(fmt_row(style.split("/")[1], groups[style], 1))
+            for variant in sorted(k for k in groups if k.startswith(style + "/")):
+                print(fmt_row(variant.split("/")[2], groups[variant], 2))
+
+    if top:
+        print()
+        print(f"heaviest {top} glyphs:")
+        heaviest = sorted(classified.items(), key=lambda kv: -stats[kv[0]]["bytes"])[:top]
+        for name, (cp, info) in heaviest:
+            s = stats[name]
+            label = (
+                f"{info['family']} {info['style']} {info['variant']} {''.join(map(str, info['levels']))}"
+                if info
+                else name
+            )
+            print(f"  U+{cp:06X} {label:<24} {s['points']:>4} pts {s['contours']:>3} contours {s['bytes']:>5} bytes")
+
+
+def print_compare(old, new):
+    def delta_rows(old_map, new_map):
+        for key in sorted(set(old_map) | set(new_map)):
+            a, b = old_map.get(key, 0), new_map.get(key, 0)
+            if a != b:
+                yield key, a, b
+
+    print(f"file: {old['file_bytes']} -> {new['file_bytes']} ({new['file_bytes'] - old['file_bytes']:+d})")
+    for tag, a, b in delta_rows(old["tables"], new["tables"]):
+        print(f"  table {tag:<6} {a:>10} -> {b:>10} ({b - a:+d})")
+    old_groups = {k: v["bytes"] for k, v in old["groups"].items()}
+    new_groups = {k: v["bytes"] for k, v in new["groups"].items()}
+    for key, a, b in delta_rows(old_groups, new_groups):
+        print(f"  glyf  {key:<22} {a:>10} -> {b:>10} ({b - a:+d})")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("font", help="built CellGaugeSymbols.ttf")
+    parser.add_argument("--json", help="write the report as JSON to this path ('-' for stdout)")
+    parser.add_argument("--glyphs", action="store_true", help="include per-glyph records in the JSON")
+    parser.add_argument("--top", type=int, default=10, help="list the N heaviest glyphs (0 to skip)")
+    parser.add_argument("--compare", help="previous JSON report to print deltas against")
+    args = parser.parse_args()
+
+    report, stats, classified = build_report(args.font, args.glyphs)
+    if args.json:
+        text = json.dumps(report, indent=2, sort_keys=True) + "\n"
+        if args.json == "-":
+            print(text, end="")
+            return 0
+        with open(args.json, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print_compare(json.load(f), report)
+    else:
+        print_report(report, stats, classified, args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
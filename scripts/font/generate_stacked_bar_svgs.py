@@ -42,6 +42,9 @@ OUTER_PAD = 40
 STYLE_IDS = ["ghb", "gfb", "nhb", "nfb", "ghn", "gfn", "nhn", "nfn"]
 DONUT_STYLE_IDS = ["hb", "fb", "hn", "fn"]
 
+# File name -> SVG text while generate_svgs() runs; None writes to OUT_DIR.
+_captured = None
+
 
 def rect(x: float, y: float, w: float, h: float) -> str:
     if w <= 0 or h <= 0:
@@ -217,6 +220,9 @@ def level_width(level: int, available_width: float, levels_max: int) -> float:
 
 
 def write_file(name: str, parts: list[str]) -> None:
+    if _captured is not None:
+        _captured[name] = wrap(parts)
+        return
     (OUT_DIR / name).write_text(wrap(parts), encoding="utf-8")
 
 
@@ -340,34 +346,7 @@ def generate_donut2() -> None:
                 write_file(f"donut2_{style}_{side}_{lvl}.svg", parts)
 
 
-def main() -> int:
-    global OUT_DIR
-    parser = argparse.ArgumentParser()
-    parser.add_argument(
-        "--styles",
-        default="all",
-        help="comma-separated: all,1,2,3,1-ghb,2-nhn,...",
-    )
-    parser.add_argument(
-        "--out-dir",
-        default=str(DEFAULT_OUT_DIR),
-        help="destination directory for generated SVG glyphs",
-    )
-    args = parser.parse_args()
-
-    try:
-        targets = parse_styles_arg(args.styles)
-    except ValueError as exc:
-        print(f"error: {exc}")
-        return 2
-
-    OUT_DIR = Path(args.out_dir).expanduser().resolve()
-    OUT_DIR.mkdir(parents=True, exist_ok=True)
-    for old in OUT_DIR.glob("bar*.svg"):
-        old.unlink()
-    for old in OUT_DIR.glob("donut*.svg"):
-        old.unlink()
-
+def generate_bars(targets: list[tuple[int, str]]) -> None:
     variants = {
         "m": {"left_cap": False, "right_cap": False},
         "l": {"left_cap": True, "right_cap": False},
@@ -424,7 +403,52 @@ def main() -> int:
 
                 write_file(f"{prefix}_{variant}_{state}.svg", parts)
 
+
+def generate_all(targets: list[tuple[int, str]]) -> None:
+    generate_bars(targets)
     generate_donut2()
+
+
+def generate_svgs(targets: list[tuple[int, str]]) -> dict[str, str]:
+    """Generate every glyph in memory instead of writing OUT_DIR."""
+    global _captured
+    _captured = {}
+    try:
+        generate_all(targets)
+        return _captured
+    finally:
+        _captured = None
+
+
+def main() -> int:
+    global OUT_DIR
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--styles",
+        default="all",
+        help="comma-separated: all,1,2,3,1-ghb,2-nhn,...",
+    )
+    parser.add_argument(
+        "--out-dir",
+        default=str(DEFAULT_OUT_DIR),
+        help="destination directory for generated SVG glyphs",
+    )
+    args = parser.parse_args()
+
+    try:
+        targets = parse_styles_arg(args.styles)
+    except ValueError as exc:
+        print(f"error: {exc}")
+        return 2
+
+    OUT_DIR = Path(args.out_dir).expanduser().resolve()
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+    for old in OUT_DIR.glob("bar*.svg"):
+        old.unlink()
+    for old in OUT_DIR.glob("donut*.svg"):
+        old.unlink()
+
+    generate_all(targets)
     return 0
 
 
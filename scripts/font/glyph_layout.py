@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Emit the binary glyph layout table that the runtime renderer loads.
+
+The table records, for every glyph family, its base codepoint and geometry,
+a bitmap of which states exist in the built font, and redirects for states
+the font deduplicates (hidden left caps, no-border variants) or renders as
+a plain space.
+
+Usage:
+  python glyph_layout.py <chart_font_ttf> [<layout_out>]
+
+Layout (little-endian):
+  header   "CGLT", u16 version, u16 family count
+  family   char[8] name, u32 base, u16 lanes, u16 levels,
+           u16 style count, u16 variant count, u32 slot count,
+           u32 bitmap offset, u32 redirect offset, u32 redirect run count,
+           u32 names offset, u16 names length, u16 reserved
+  bitmap   ceil(slots / 8) bytes, bit i set when slot i has a glyph
+  redirect runs of (u32 first slot, u32 count, u32 first target slot):
+           slot + i redirects to target + i; target 0xFFFFFFFF is a space
+  names    ASCII "<style>,<style>,...|<variant>,<variant>,..."
+
+A slot is style * style_block + variant * states + state, with
+states = (levels + 1) ** lanes, matching codepoint_for_info.
+"""
+
+import struct
+import sys
+from pathlib import Path
+
+from fontTools.ttLib import TTFont
+
+from align_to_menlo_capheight import (
+    BAR1_BASE,
+    BAR1_LEVELS,
+    BAR2_BASE,
+    BAR3_BASE,
+    BAR_STYLE_IDS,
+    BAR_VARIANTS,
+    DONUT2_BASE,
+    DONUT_LEVELS,
+    DONUT_SIDES,
+    DONUT_STYLES,
+    LEVELS,
+)
+
+LAYOUT_MAGIC = b"CGLT"
+LAYOUT_VERSION = 1
+LAYOUT_SUFFIX = ".layout"
+SPACE_TARGET = 0xFFFFFFFF
+
+HEADER = struct.Struct("<4sHH")
+FAMILY = struct.Struct("<8sIHHHHIIIIIHH")
+REDIRECT = struct.Struct("<III")
+
+# name, base, lanes, levels, styles, variants
+FAMILIES = (
+    ("bar1", BAR1_BASE, 1, BAR1_LEVELS, BAR_STYLE_IDS, BAR_VARIANTS),
+    ("bar2", BAR2_BASE, 2, LEVELS, BAR_STYLE_IDS, BAR_VARIANTS),
+    ("bar3", BAR3_BASE, 3, LEVELS, BAR_STYLE_IDS, BAR_VARIANTS),
+    ("donut2", DONUT2_BASE, 1, DONUT_LEVELS, DONUT_STYLES, DONUT_SIDES),
+)
+
+
+def state_levels(state, lanes, stride):
+    out = []
+    for _ in range(lanes):
+        out.append(state % stride)
+        state //= stride
+    return tuple(reversed(out))
+
+
+def info_for_codepoint(cp):
+    """(family, style, variant, levels) for a final chart codepoint, or None."""
+    for name, base, lanes, levels, styles, variants in FAMILIES:
+        states = (levels + 1) ** lanes
+        style_block = len(variants) * states
+        slot = cp - base
+        if 0 <= slot < len(styles) * style_block:
+            variant, state = divmod(slot % style_block, states)
+            return name, styles[slot // style_block], variants[variant], state_levels(state, lanes, levels + 1)
+    return None
+
+
+def bar_fallbacks(style, variant, lanes):
+    # Same substitutions the generator's dedupe relies on: hidden left caps
+    # fall back to the capless variant, no-border styles only keep "m", and
+    # single-lane bars have no gapped styles.
+    styles = [style]
+    if lanes == 1 and style.startswith("g"):
+        styles.append("n" + style[1:])
+    variants = [variant]
+    if variant == "l":
+        variants.append("m")
+    elif variant == "s":
+        variants.append("r")
+    if style.endswith("n") and "m" not in variants:
+        variants.append("m")
+    return [(s, v) for s in styles for v in variants]
+
+
+def family_slots(name, base, lanes, levels, styles, variants, cmap):
+    stride = levels + 1
+    states = stride ** lanes
+    style_block = len(variants) * states
+    slot_count = len(styles) * style_block
+
+    def slot_of(style, variant, state):
+        return styles.index(style) * style_block + variants.index(variant) * states + state
+
+    present = [base + slot in cmap for slot in range(slot_count)]
+    redirects = []
+    for slot in range(slot_count):
+        if present[slot]:
+            continue
+        style = styles[slot // style_block]
+        variant = variants[(slot % style_block) // states]
+        state = slot % states
+        levels_tuple = state_levels(state, lanes, stride)
+        empty = all(level == 0 for level in levels_tuple)
+
+        if name.startswith("bar"):
+            if style.endswith("n") and empty:
+                redirects.append((slot, SPACE_TARGET))
+                continue
+            for alt_style, alt_variant in bar_fallbacks(style, variant, lanes)[1:]:
+                target = slot_of(alt_style, alt_variant, state)
+                if present[target]:
+                    redirects.append((slot, target))
+                    break
+        elif style.endswith("n") and empty:
+            # Empty no-border donuts render as a space.
+            redirects.append((slot, SPACE_TARGET))
+
+    return slot_count, present, redirects
+
+
+def redirect_runs(redirects):
+    runs = []
+    for slot, target in redirects:
+        if runs:
+            first, count, first_target = runs[-1]
+            if slot == first + count and (
+                target == first_target == SPACE_TARGET
+                or (first_target != SPACE_TARGET and target == first_target + count)
+            ):
+                runs[-1] = (first, count + 1, first_target)
+                continue
+        runs.append((slot, 1, target))
+    return runs
+
+
+def build_layout(cmap):
+    records = []
+    blobs = []
+    offset = HEADER.size + FAMILY.size * len(FAMILIES)
+    for name, base, lanes, levels, styles, variants in FAMILIES:
+        slot_count, present, redirects = family_slots(name, base, lanes, levels, styles, variants, cmap)
+
+        bitmap = bytearray((slot_count + 7) // 8)
+        for slot, ok in enumerate(present):
+            if ok:
+                bitmap[slot >> 3] |= 1 << (slot & 7)
+        runs = redirect_runs(redirects)
+        redirect_blob = b"".join(REDIRECT.pack(*run) for run in runs)
+        names = f"{','.join(styles)}|{','.join(variants)}".encode("ascii")
+
+        bitmap_offset = offset
+        redirect_offset = bitmap_offset + len(bitmap)
+        names_offset = redirect_offset + len(redirect_blob)
+        offset = names_offset + len(names)
+
+        records.append(
+            FAMILY.pack(
+                name.encode("ascii"),
+                base,
+                lanes,
+                levels,
+                len(styles),
+                len(variants),
+                slot_count,
+                bitmap_offset,
+                redirect_offset,
+                len(runs),
+                names_offset,
+                len(names),
+                0,
+            )
+        )
+        blobs.extend((bytes(bitmap), redirect_blob, names))
+
+    return HEADER.pack(LAYOUT_MAGIC, LAYOUT_VERSION, len(FAMILIES)) + b"".join(records) + b"".join(blobs)
+
+
+def layout_path_for(font_path):
+    return Path(font_path).with_suffix(LAYOUT_SUFFIX)
+
+
+def write_layout(cmap, out_path):
+    data = build_layout(cmap)
+    Path(out_path).write_bytes(data)
+    return len(data)
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        print("usage: glyph_layout.py <chart_font_ttf> [<layout_out>]", file=sys.stderr)
+        return 2
+
+    font_path = sys.argv[1]
+    out_path = sys.argv[2] if len(sys.argv) == 3 else layout_path_for(font_path)
+    cmap = TTFont(font_path)["cmap"].getBestCmap() or {}
+    size = write_layout(cmap, out_path)
+    print(f"{out_path} ({size} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
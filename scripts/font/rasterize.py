@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Rasterize CellGauge glyphs onto a terminal-cell pixel grid.
+
+Glyphs are drawn the way a terminal places them: one advance-wide cell per
+glyph, with the cell's left and right edges snapped to pixel boundaries
+(the advance is rounded to whole pixels and x is scaled to fit it) and the
+baseline on a pixel boundary. Outlines are clipped to the cell, so the join
+overlap past the advance is dropped and neighbouring cells tile exactly.
+
+Vertically, the y values of horizontal outline edges (lane bounds, border
+lines) are snapped to pixel rows, at least one row apart where the cell has
+room, and everything in between is interpolated. Snapping is per (family,
+style) group, and neighbouring cells always share a group, so lanes and
+borders line up across joins.
+
+Coverage is computed with a numpy scanline pass over an oversampled grid
+(nonzero winding), then quantized to the requested bit depth.
+
+Usage:
+  python rasterize.py <chart_font_ttf> <codepoint_hex> [--ppem N] [--depth BITS]
+"""
+
+import argparse
+import math
+
+import numpy as np
+from fontTools.pens.basePen import BasePen
+from fontTools.ttLib import TTFont
+
+from glyph_layout import info_for_codepoint
+
+CURVE_STEPS = 8
+DEFAULT_OVERSAMPLE = 4
+BIT_DEPTHS = (1, 2, 4, 8)
+
+
+class FlattenPen(BasePen):
+    """Collects outlines as closed polygons, flattening curves."""
+
+    def __init__(self, glyph_set):
+        super().__init__(glyph_set)
+        self.contours = []
+        self.current = None
+
+    def _moveTo(self, pt):
+        self.current = [pt]
+        self.contours.append(self.current)
+
+    def _lineTo(self, pt):
+        self.current.append(pt)
+
+    def _qCurveToOne(self, pt1, pt2):
+        (x0, y0), (x1, y1), (x2, y2) = self._getCurrentPoint(), pt1, pt2
+        for i in range(1, CURVE_STEPS + 1):
+            t = i / CURVE_STEPS
+            u = 1 - t
+            self.current.append((u * u * x0 + 2 * u * t * x1 + t * t * x2, u * u * y0 + 2 * u * t * y1 + t * t * y2))
+
+    def _curveToOne(self, pt1, pt2, pt3):
+        (x0, y0), (x1, y1), (x2, y2), (x3, y3) = self._getCurrentPoint(), pt1, pt2, pt3
+        for i in range(1, CURVE_STEPS + 1):
+            t = i / CURVE_STEPS
+            u = 1 - t
+            a, b, c, d = u * u * u, 3 * u * u * t, 3 * u * t * t, t * t * t
+            self.current.append((a * x0 + b * x1 + c * x2 + d * x3, a * y0 + b * y1 + c * y2 + d * y3))
+
+    def _closePath(self):
+        self.current = None
+
+    _endPath = _closePath
+
+
+class CellGrid:
+    """Pixel geometry of one terminal cell at a given ppem."""
+
+    def __init__(self, ttfont, ppem):
+        upm = ttfont["head"].unitsPerEm
+        head = ttfont["head"]
+        advance = max(width for width, _ in ttfont["hmtx"].metrics.values())
+        scale = ppem / upm
+
+        self.ppem = ppem
+        self.advance_units = advance
+        self.width = max(1, round(advance * scale))
+        # Rows above and below the baseline that can receive ink.
+        self.top = math.ceil(head.yMax * scale)
+        self.bottom = math.floor(head.yMin * scale)
+        self.height = self.top - self.bottom
+        self.x_scale = self.width / advance
+        self.y_scale = scale
+
+
+def horizontal_keys(contours):
+    """y values of the horizontal edges of flattened contours."""
+    keys = set()
+    for contour in contours:
+        for (_, y0), (_, y1) in zip(contour, contour[1:] + contour[:1]):
+            if y0 == y1:
+                keys.add(y0)
+    return keys
+
+
+class YSnap:
+    """Piecewise-linear font-unit y -> pixel y (up) through snapped keys."""
+
+    def __init__(self, keys, grid):
+        scale = grid.y_scale
+        keys = sorted(keys)
+        rows = [round(y * scale) for y in keys]
+        # Keep distinct keys at least one row apart, pushing up and then,
+        # if that ran out of room, back down from the top of the cell.
+        spaced = list(rows)
+        for i in range(1, len(spaced)):
+            spaced[i] = max(spaced[i], spaced[i - 1] + 1)
+        if spaced and spaced[-1] > grid.top:
+            spaced[-1] = grid.top
+            for i in range(len(spaced) - 2, -1, -1):
+                spaced[i] = min(spaced[i], spaced[i + 1] - 1)
+        if not spaced or spaced[0] >= grid.bottom:
+            rows = spaced
+        self.keys = np.asarray(keys, dtype=np.float64)
+        self.rows = np.asarray(rows, dtype=np.float64)
+        self.scale = scale
+
+    def __call__(self, y):
+        if len(self.keys) == 0:
+            return y * self.scale
+        out = np.interp(y, self.keys, self.rows)
+        below, above = y < self.keys[0], y > self.keys[-1]
+        out[below] = self.rows[0] + (y[below] - self.keys[0]) * self.scale
+        out[above] = self.rows[-1] + (y[above] - self.keys[-1]) * self.scale
+        return out
+
+
+class GlyphRasterizer:
+    def __init__(self, ttfont, oversample=DEFAULT_OVERSAMPLE, group_snap=True):
+        self.ttfont = ttfont
+        self.glyph_set = ttfont.getGlyphSet()
+        self.oversample = oversample
+        self.grids = {}
+        self.snaps = {}
+        self.outlines = {}
+        # Snapping group per glyph: (family, style) for chart glyphs, or
+        # each glyph on its own without group_snap.
+        self.group_of = {}
+        self.group_members = {}
+        for cp, name in ttfont.getBestCmap().items() if group_snap else ():
+            info = info_for_codepoint(cp)
+            group = info[:2] if info else name
+            self.group_of[name] = group
+            self.group_members.setdefault(group, []).append(name)
+
+    def contours(self, glyph_name):
+        contours = self.outlines.get(glyph_name)
+        if contours is None:
+            pen = FlattenPen(self.glyph_set)
+            self.glyph_set[glyph_name].draw(pen)
+            contours = self.outlines[glyph_name] = [c for c in pen.contours if len(c) >= 2]
+        return contours
+
+    def snap(self, glyph_name, grid):
+        group = self.group_of.get(glyph_name, glyph_name)
+        key = (group, grid.ppem)
+        snap = self.snaps.get(key)
+        if snap is None:
+            keys = set()
+            for name in self.group_members.get(group, [glyph_name]):
+                keys |= horizontal_keys(self.contours(name))
+            snap = self.snaps[key] = YSnap(keys, grid)
+        return snap
+
+    def grid(self, ppem):
+        grid = self.grids.get(ppem)
+        if grid is None:
+            grid = self.grids[ppem] = CellGrid(self.ttfont, ppem)
+        return grid
+
+    def edges(self, glyph_name, grid):
+        """Non-horizontal polygon edges in oversampled pixel space (y down)."""
+        contours = self.contours(glyph_name)
+        if not contours:
+            return np.empty((0, 4))
+        seg = np.concatenate(
+            [np.concatenate([pts, np.roll(pts, -1, axis=0)], axis=1) for pts in map(np.asarray, contours)]
+        ).astype(np.float64)
+        s = self.oversample
+        snap = self.snap(glyph_name, grid)
+        seg[:, [0, 2]] *= grid.x_scale * s
+        seg[:, 1] = (grid.top - snap(seg[:, 1])) * s
+        seg[:, 3] = (grid.top - snap(seg[:, 3])) * s
+        return seg[seg[:, 1] != seg[:, 3]]
+
+    def coverage(self, glyph_name, ppem):
+        """Per-pixel ink coverage in [0, 1], shape (height, width)."""
+        grid = self.grid(ppem)
+        s = self.oversample
+        rows, cols = grid.height * s, grid.width * s
+        seg = self.edges(glyph_name, grid)
+        if not len(seg):
+            return np.zeros((grid.height, grid.width))
+
+        x0, y0, x1, y1 = seg.T
+        direction = np.where(y1 > y0, 1, -1)
+        ys = np.arange(rows)[:, None] + 0.5
+        lo, hi = np.minimum(y0, y1), np.maximum(y0, y1)
+        active = (ys >= lo) & (ys < hi)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            xc = x0 + (ys - y0) * (x1 - x0) / (y1 - y0)
+        xc = np.where(active, xc, np.inf)
+
+        # Winding number just right of each crossing, per scanline.
+        order = np.argsort(xc, axis=1)
+        xs_sorted = np.take_along_axis(xc, order, axis=1)
+        dirs = np.where(active, direction, 0)
+        winding = np.cumsum(np.take_along_axis(dirs, order, axis=1), axis=1)
+
+        # Count crossings left of each sample centre with one flat search:
+        # clamp crossings just outside the cell (order is preserved) and
+        # offset every scanline into its own band so rows never mix.
+        band = cols + 4.0
+        offsets = np.arange(rows)[:, None] * band
+        keys = (np.clip(xs_sorted, -1.0, cols + 1.0) + 1.0 + offsets).ravel()
+        queries = (np.arange(cols)[None, :] + 1.5 + offsets).ravel()
+        idx = np.searchsorted(keys, queries, side="right").reshape(rows, cols)
+        count = idx - np.arange(rows)[:, None] * xc.shape[1]
+        padded = np.concatenate([np.zeros((rows, 1), dtype=winding.dtype), winding], axis=1)
+        inside = np.take_along_axis(padded, count, axis=1) != 0
+
+        return inside.reshape(grid.height, s, grid.width, s).mean(axis=(1, 3))
+
+    def levels(self, glyph_name, ppem, depth):
+        """Coverage quantized to 2**depth levels (uint8)."""
+        top = (1 << depth) - 1
+        return np.floor(self.coverage(glyph_name, ppem) * top + 0.5).astype(np.uint8)
+
+
+def pack_bits(levels, depth):
+    """Bit-aligned EBDT image data: pixels MSB-first, rows unpadded."""
+    bits = np.unpackbits(levels.reshape(-1, 1), axis=1)[:, 8 - depth :]
+    return np.packbits(bits.ravel()).tobytes()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("font", help="built CellGaugeSymbols.ttf")
+    parser.add_argument("codepoint", help="codepoint in hex, e.g. 10fa28")
+    parser.add_argument("--ppem", type=int, default=16)
+    parser.add_argument("--depth", type=int, choices=BIT_DEPTHS, default=1)
+    args = parser.parse_args()
+
+    font = TTFont(args.font)
+    name = font.getBestCmap()[int(args.codepoint, 16)]
+    raster = GlyphRasterizer(font)
+    levels = raster.levels(name, args.ppem, args.depth)
+    ramp = " .:-=+*#%@"
+    top = (1 << args.depth) - 1
+    for row in levels:
+        print("|" + "".join(ramp[round(v / top * (len(ramp) - 1))] for v in row) + "|")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Rebuild a preview CellGauge font whenever the glyph sources change.
+
+The generator and aligner stay loaded in one process. When one of their
+sources is saved, the changed modules are reloaded and every glyph SVG is
+regenerated in memory (a fraction of a second). Only the (family, style)
+groups whose SVGs differ are converted to outlines again; after an aligner
+change every group is realigned from the cached outlines, but only groups
+whose aligned outlines differ count as changed. The preview font and its
+glyph layout are then replaced atomically.
+
+The preview skips fantasticon: SVGs are imported with fontTools using the
+same normalization (fontHeight 1000, descent 200), so outlines match a full
+rebuild to within rounding. Ship fonts from rebuild-font.js only.
+
+Alignment targets come from Menlo when it is installed, otherwise from the
+packaged font (or --metrics-from).
+
+Usage:
+  python watch_font.py [--output PATH] [--metrics-from FONT] [--interval SECONDS] [--once]
+"""
+
+import argparse
+import array
+import hashlib
+import importlib
+import os
+import re
+import struct
+import time
+import traceback
+from pathlib import Path
+
+import numpy as np
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.cu2quPen import Cu2QuPen
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from fontTools.svgLib.path import SVGPath
+from fontTools.ttLib import TTFont
+from fontTools.ttLib.tables._g_l_y_f import Glyph, flagOnCurve
+
+import align_to_menlo_capheight as align
+import generate_stacked_bar_svgs as generator
+import glyph_layout
+
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+PACKAGED_FONT = ROOT_DIR / "fonts" / "CellGaugeSymbols.ttf"
+DEFAULT_OUTPUT = ROOT_DIR / ".font-build" / "preview" / "CellGaugeSymbolsPreview.ttf"
+
+# Mirrors fantasticon.config.js.
+FONT_HEIGHT = 1000
+DESCENT = 200
+CURVE_MAX_ERR = 1.0
+# generate_stacked_bar_svgs.wrap() and rect() output.
+SVG_VIEWBOX = re.compile(r'viewBox="0 0 ([0-9.]+) ([0-9.]+)"')
+SVG_RECT = re.compile(r'<rect x="([^"]+)" y="([^"]+)" width="([^"]+)" height="([^"]+)"')
+
+PREVIEW_FAMILY = "CellGauge Symbols Preview"
+PREVIEW_PS_NAME = "CellGaugeSymbolsPreview-Regular"
+
+# Reload order matters: glyph_layout imports the aligner's constants.
+MODULES = (generator, align, glyph_layout)
+
+
+def svg_transform(svg_text):
+    """fantasticon's import transform for one SVG, and the glyph advance."""
+    vb_w, vb_h = (float(v) for v in SVG_VIEWBOX.search(svg_text).groups())
+    k = FONT_HEIGHT / vb_h
+    # Flip y with the baseline DESCENT above the bottom edge.
+    return (k, 0, 0, -k, 0, FONT_HEIGHT - DESCENT), round(vb_w * k)
+
+
+def path_glyph(svg_text, transform):
+    pen = TTGlyphPen(None)
+    SVGPath.fromstring(svg_text.encode(), transform=transform).draw(Cu2QuPen(pen, CURVE_MAX_ERR))
+    return pen.glyph()
+
+
+def rect_template(count):
+    """Contours and flags of a glyph made of count rectangles."""
+    glyph = Glyph()
+    glyph.numberOfContours = count
+    glyph.endPtsOfContours = list(range(3, 4 * count, 4))
+    glyph.flags = array.array("B", [flagOnCurve]) * (4 * count)
+    return glyph
+
+
+def svg_glyphs(svgs):
+    """Glyph name -> (glyph, advance) for generator SVGs.
+
+    Bar glyphs are rects only; those skip the SVG path parser and are
+    transformed in one vectorized pass, each rect clockwise from its top-left
+    corner like fantasticon's output.
+    """
+    out = {}
+    names, boxes, counts, transforms = [], [], [], []
+    for name, text in svgs.items():
+        transform, advance = svg_transform(text)
+        if "<path" in text:
+            out[name] = (path_glyph(text, transform), advance)
+            continue
+        found = SVG_RECT.findall(text)
+        if not found:
+            out[name] = (TTGlyphPen(None).glyph(), advance)
+            continue
+        out[name] = (None, advance)
+        names.append(name)
+        boxes.extend(found)
+        counts.append(4 * len(found))
+        transforms.append(transform)
+    if not names:
+        return out
+
+    x, y, w, h = np.asarray(boxes, dtype=np.float64).T
+    corners = np.stack([x, y, x + w, y, x + w, y + h, x, y + h], axis=1).reshape(-1, 2)
+    rows = np.repeat(np.asarray(transforms, dtype=np.float64), counts, axis=0)
+    points = align.transform_points(corners, rows)
+    templates = {}
+    start = 0
+    for name, count in zip(names, counts):
+        template = templates.get(count) or templates.setdefault(count, rect_template(count // 4))
+        out[name] = (align.simple_glyph(template, points[start : start + count]), out[name][1])
+        start += count
+    return out
+
+
+def targets_from_font(ttfont):
+    """Alignment targets measured back from an already aligned font."""
+    cmap = ttfont.getBestCmap()
+    glyf = ttfont["glyf"]
+
+    def full_bar(style):
+        info = {"family": "bar1", "style": style, "variant": "m", "levels": (align.BAR1_LEVELS,)}
+        name = cmap[align.codepoint_for_info(info)]
+        g = glyf[name]
+        g.recalcBounds(glyf)
+        return name, g
+
+    cap_name, cap = full_bar("nhb")
+    _, full = full_bar("nfb")
+    advance, _ = ttfont["hmtx"][cap_name]
+    return {
+        "h_y_min": float(cap.yMin),
+        "h_y_max": float(cap.yMax),
+        "full_y_min": float(full.yMin),
+        "full_y_max": float(full.yMax),
+        "advance": float(advance),
+    }
+
+
+def load_targets(metrics_from):
+    if metrics_from is None and os.path.exists(align.MENLO_PATH):
+        targets = align.menlo_targets(float(FONT_HEIGHT))
+        if targets:
+            return targets, align.MENLO_PATH
+    path = metrics_from or PACKAGED_FONT
+    return targets_from_font(TTFont(path)), str(path)
+
+
+def group_svgs(svgs):
+    """(family, style) -> {glyph name: svg text}, and each name's shape info."""
+    groups = {}
+    info_by_name = {}
+    for file_name, text in svgs.items():
+        name = file_name[: -len(".svg")]
+        info = align.parse_shape_name(name)
+        if info:
+            groups.setdefault((info["family"], info["style"]), {})[name] = text
+            info_by_name[name] = info
+    return groups, info_by_name
+
+
+def digest(items):
+    h = hashlib.sha1()
+    for item in items:
+        h.update(repr(item).encode())
+    return h.hexdigest()
+
+
+def compile_simple_glyph(glyph, bounds):
+    """glyf bytes with every coordinate delta stored as a full word.
+
+    Larger than fontTools' packed encoding, but vectorized; the preview
+    font's size does not matter.
+    """
+    pts = np.frombuffer(glyph.coordinates.array, dtype=np.float64).reshape(-1, 2).astype(np.int64)
+    deltas = np.diff(pts, axis=0, prepend=np.zeros((1, 2), dtype=np.int64))
+    flags = np.asarray(glyph.flags, dtype=np.uint8) & flagOnCurve
+    return b"".join(
+        (
+            struct.pack(">5h", glyph.numberOfContours, *bounds),
+            np.asarray(glyph.endPtsOfContours, dtype=">u2").tobytes(),
+            b"\0\0",  # no instructions
+            flags.tobytes(),
+            deltas[:, 0].astype(">i2").tobytes(),
+            deltas[:, 1].astype(">i2").tobytes(),
+        )
+    )
+
+
+class CompiledGlyph:
+    """Aligned glyph kept as compiled glyf bytes plus what the tables need."""
+
+    __slots__ = ("data", "metrics", "bounds", "points", "contours")
+
+    def __init__(self, glyf, hmtx, name):
+        g = align.recalc_bounds(glyf, name)
+        self.metrics = hmtx[name]
+        if g.numberOfContours <= 0:
+            self.data, self.bounds, self.points, self.contours = b"", None, 0, 0
+            return
+        self.bounds = (g.xMin, g.yMin, g.xMax, g.yMax)
+        self.data = compile_simple_glyph(g, self.bounds)
+        self.points = len(g.coordinates)
+        self.contours = g.numberOfContours
+
+
+class PreviewBuilder:
+    """Per-group outline cache; rebuilds only the groups that changed."""
+
+    def __init__(self, targets):
+        self.targets = targets
+        self.info_by_name = {}
+        self.svg_digest = {}
+        self.raw = {}
+        self.aligned = {}
+        self.aligned_digest = {}
+
+    def align(self, group):
+        family, style = group
+        raw = self.raw[group]
+        names = sorted(raw)
+        glyf = {name: raw[name][0] for name in names}
+        hmtx = {name: (raw[name][1], 0) for name in names}
+        align.align_styled_group(glyf, hmtx, names, self.info_by_name, self.targets, family, style)
+        return {name: CompiledGlyph(glyf, hmtx, name) for name in names}
+
+    def update(self, svgs, realign):
+        """Fold in a fresh SVG set; returns the groups whose outlines changed."""
+        groups, self.info_by_name = group_svgs(svgs)
+        dirty = set()
+        for group, members in groups.items():
+            d = digest(sorted(members.items()))
+            if d != self.svg_digest.get(group):
+                self.svg_digest[group] = d
+                self.raw[group] = svg_glyphs(members)
+                dirty.add(group)
+        if realign:
+            dirty = set(groups)
+
+        changed = []
+        for group in sorted(dirty):
+            aligned = self.align(group)
+            d = digest((name, g.data, g.metrics) for name, g in sorted(aligned.items()))
+            if d != self.aligned_digest.get(group):
+                self.aligned[group] = aligned
+                self.aligned_digest[group] = d
+                changed.append(group)
+        for group in sorted(set(self.raw) - set(groups)):
+            for cache in (self.svg_digest, self.raw, self.aligned, self.aligned_digest):
+                cache.pop(group, None)
+            changed.append(group)
+        return changed
+
+    def cmap(self):
+        out = {}
+        for members in self.aligned.values():
+            for name in members:
+                out[align.codepoint_for_info(self.info_by_name[name])] = name
+        return dict(sorted(out.items()))
+
+    def build_font(self):
+        aw = int(round(self.targets["advance"]))
+        glyphs = {".notdef": Glyph(b"")}
+        metrics = {".notdef": (aw, 0)}
+        inked = []
+        for group in sorted(self.aligned):
+            for name, g in sorted(self.aligned[group].items()):
+                glyphs[name] = Glyph(g.data)
+                metrics[name] = g.metrics
+                if g.bounds:
+                    inked.append(g)
+
+        # Glyphs are already compiled, so skip fontTools' bounds pass (it
+        # would decompile every glyph) and fill in the summary fields here.
+        x_min = min(g.bounds[0] for g in inked)
+        y_min = min(g.bounds[1] for g in inked)
+        x_max = max(g.bounds[2] for g in inked)
+        y_max = max(g.bounds[3] for g in inked)
+        lsbs = [g.metrics[1] for g in inked]
+        extents = [g.metrics[1] + g.bounds[2] - g.bounds[0] for g in inked]
+
+        cap_height = int(round(self.targets["h_y_max"]))
+        fb = FontBuilder(FONT_HEIGHT, isTTF=True)
+        fb.font.recalcBBoxes = False
+        fb.setupGlyphOrder(list(glyphs))
+        fb.setupCharacterMap(self.cmap())
+        fb.setupGlyf(glyphs, calcGlyphBounds=False, validateGlyphFormat=False)
+        fb.setupHorizontalMetrics(metrics)
+        fb.setupHorizontalHeader(
+            ascent=FONT_HEIGHT - DESCENT,
+            descent=-DESCENT,
+            advanceWidthMax=max(m[0] for m in metrics.values()),
+            minLeftSideBearing=min(lsbs),
+            minRightSideBearing=min(g.metrics[0] - e for g, e in zip(inked, extents)),
+            xMaxExtent=max(extents),
+        )
+        fb.setupNameTable(
+            {
+                "familyName": PREVIEW_FAMILY,
+                "styleName": align.FONT_SUBFAMILY,
+                "uniqueFontIdentifier": f"{PREVIEW_FAMILY} {align.FONT_SUBFAMILY};{PREVIEW_PS_NAME}",
+                "fullName": f"{PREVIEW_FAMILY} {align.FONT_SUBFAMILY}",
+                "psName": PREVIEW_PS_NAME,
+            }
+        )
+        fb.setupOS2(
+            sTypoAscender=FONT_HEIGHT - DESCENT,
+            sTypoDescender=-DESCENT,
+            usWinAscent=max(y_max, 0),
+            usWinDescent=max(-y_min, 0),
+            sCapHeight=cap_height,
+            sxHeight=int(round(cap_height * 0.75)),
+        )
+        fb.font["OS/2"].updateFirstAndLastCharIndex(fb.font)
+        fb.setupPost(keepGlyphNames=False)
+
+        head = fb.font["head"]
+        head.xMin, head.yMin, head.xMax, head.yMax = x_min, y_min, x_max, y_max
+        maxp = fb.font["maxp"]
+        maxp.maxPoints = max(g.points for g in inked)
+        maxp.maxContours = max(g.contours for g in inked)
+        return fb.font
+
+
+def write_atomic(path, data):
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def write_preview(builder, output):
+    output.parent.mkdir(parents=True, exist_ok=True)
+    font = builder.build_font()
+    layout = glyph_layout.build_layout(font.getBestCmap())
+    tmp = output.with_name(f".{output.name}.tmp")
+    font.save(tmp)
+    # Layout first: a reader that sees the new font also sees its layout.
+    write_atomic(glyph_layout.layout_path_for(output), layout)
+    os.replace(tmp, output)
+
+
+def source_mtimes():
+    return {m.__name__: os.stat(m.__file__).st_mtime_ns for m in MODULES}
+
+
+def reload_changed(changed):
+    """Reload changed modules (and dependants); False if one fails to load."""
+    reload_rest = False
+    try:
+        for module in MODULES:
+            if reload_rest or module.__name__ in changed:
+                importlib.reload(module)
+                reload_rest = reload_rest or module is align
+    except Exception:
+        traceback.print_exc()
+        return False
+    return True
+
+
+def rebuild(builder, output, realign, force=False):
+    started = time.perf_counter()
+    svgs = generator.generate_svgs(generator.parse_styles_arg("all"))
+    changed = builder.update(svgs, realign)
+    if not changed and not force:
+        print(f"no glyph changes ({time.perf_counter() - started:.2f}s)", flush=True)
+        return
+    write_preview(builder, output)
+    labels = sorted({f"{family} {style}" for family, style in changed})
+    summary = ", ".join(labels) if len(labels) <= 8 else f"{len(labels)} groups"
+    print(f"rebuilt {summary} in {time.perf_counter() - started:.2f}s -> {output}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="preview font path")
+    parser.add_argument("--metrics-from", help="take alignment targets from this built font instead of Menlo")
+    parser.add_argument("--interval", type=float, default=0.25, help="source polling interval in seconds")
+    parser.add_argument("--once", action="store_true", help="build the preview once and exit")
+    args = parser.parse_args()
+
+    targets, source = load_targets(args.metrics_from)
+    print(f"alignment targets from {source}", flush=True)
+    builder = PreviewBuilder(targets)
+    output = args.output.expanduser().resolve()
+    rebuild(builder, output, realign=True, force=True)
+    if args.once:
+        return 0
+
+    watched = ", ".join(Path(m.__file__).name for m in MODULES)
+    print(f"watching {watched}", flush=True)
+    seen = source_mtimes()
+    try:
+        while True:
+            time.sleep(args.interval)
+            current = source_mtimes()
+            if current == seen:
+                continue
+            # Let an editor finish writing before reloading.
+            time.sleep(args.interval)
+            current = source_mtimes()
+            changed = {name for name in current if current[name] != seen[name]}
+            seen = current
+            if not reload_changed(changed):
+                print("keeping the previous preview", flush=True)
+                continue
+            try:
+                rebuild(
+                    builder,
+                    output,
+                    realign=align.__name__ in changed,
+                    force=glyph_layout.__name__ in changed,
+                )
+            except Exception:
+                traceback.print_exc()
+                print("keeping the previous preview", flush=True)
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -10,9 +10,15 @@ const ICONS_DIR = path.join(BUILD_DIR, "icons");
 const DIST_DIR = path.join(BUILD_DIR, "dist");
 const FONT_DIR = path.join(ROOT_DIR, "fonts");
 const TARGET_TTF = path.join(FONT_DIR, "CellGaugeSymbols.ttf");
+const TARGET_LAYOUT = path.join(FONT_DIR, "CellGaugeSymbols.layout");
 const BUILT_TTF = path.join(DIST_DIR, "CellGaugeSymbols.ttf");
+const BUILT_LAYOUT = path.join(DIST_DIR, "CellGaugeSymbols.layout");
 const PY_GENERATOR = path.join(ROOT_DIR, "scripts", "font", "generate_stacked_bar_svgs.py");
 const PY_ALIGN = path.join(ROOT_DIR, "scripts", "font", "align_to_menlo_capheight.py");
+const PY_CHECK_JOINS = path.join(ROOT_DIR, "scripts", "font", "check_joins.py");
+const PY_CHECK_GOLDEN = path.join(ROOT_DIR, "scripts", "font", "check_golden.py");
+const PY_EMBED_BITMAPS = path.join(ROOT_DIR, "scripts", "font", "embed_bitmaps.py");
+const PY_WATCH = path.join(ROOT_DIR, "scripts", "font", "watch_font.py");
 const FANTASTICON_CONFIG = path.join("scripts", "font", "fantasticon.config.js");
 
 function fail(message) {
@@ -61,17 +67,63 @@ function ensurePythonModule(python, moduleName, helpText) {
   }
 }
 
-function main() {
-  fs.mkdirSync(ICONS_DIR, { recursive: true });
-  fs.mkdirSync(DIST_DIR, { recursive: true });
-  fs.mkdirSync(FONT_DIR, { recursive: true });
+function parseArgs(argv) {
+  const out = { bitmaps: null, depth: null, watch: false, updateGolden: false };
+  for (let i = 0; i < argv.length; i += 1) {
+    const a = argv[i];
+    if (a === "--bitmaps") {
+      // Optional value: --bitmaps alone uses embed_bitmaps.py's default sizes.
+      out.bitmaps = argv[i + 1] && !argv[i + 1].startsWith("--") ? argv[(i += 1)] : "";
+      continue;
+    }
+    if (a === "--bitmap-depth") {
+      if (i + 1 >= argv.length) fail("--bitmap-depth needs a value");
+      out.depth = argv[(i += 1)];
+      continue;
+    }
+    if (a === "--watch") {
+      out.watch = true;
+      continue;
+    }
+    if (a === "--update-golden") {
+      out.updateGolden = true;
+      continue;
+    }
+    if (a.startsWith("--bitmaps=")) {
+      out.bitmaps = a.slice("--bitmaps=".length);
+      continue;
+    }
+    if (a.startsWith("--bitmap-depth=")) {
+      out.depth = a.slice("--bitmap-depth=".length);
+      continue;
+    }
+    fail(`unknown option: ${a}`);
+  }
+  return out;
+}
 
+function main() {
+  const args = parseArgs(process.argv.slice(2));
   const python = resolvePython();
   ensurePythonModule(
     python,
     "fontTools",
     "python module 'fontTools' is required; run `pip install -r scripts/font/requirements.txt`",
   );
+  ensurePythonModule(
+    python,
+    "numpy",
+    "python module 'numpy' is required; run `pip install -r scripts/font/requirements.txt`",
+  );
+  if (args.watch) {
+    // Preview only: the watcher writes its own font under .font-build/preview.
+    run(python, [PY_WATCH], { cwd: ROOT_DIR });
+    return;
+  }
+
+  fs.mkdirSync(ICONS_DIR, { recursive: true });
+  fs.mkdirSync(DIST_DIR, { recursive: true });
+  fs.mkdirSync(FONT_DIR, { recursive: true });
   run(python, [PY_GENERATOR, "--out-dir", ICONS_DIR], { cwd: ROOT_DIR });
 
   const fantasticon = resolveFantasticonCommand();
@@ -87,9 +139,24 @@ function main() {
   }
 
   run(python, [PY_ALIGN, BUILT_TTF], { cwd: ROOT_DIR });
+  run(python, [PY_CHECK_JOINS, BUILT_TTF], { cwd: ROOT_DIR });
+  // Check outlines before any bitmap strikes are embedded.
+  const goldenArgs = [PY_CHECK_GOLDEN, BUILT_TTF];
+  if (args.updateGolden) goldenArgs.push("--update");
+  run(python, goldenArgs, { cwd: ROOT_DIR });
+  if (args.bitmaps !== null) {
+    const embedArgs = [PY_EMBED_BITMAPS, BUILT_TTF];
+    if (args.bitmaps) embedArgs.push("--ppem", args.bitmaps);
+    if (args.depth) embedArgs.push("--depth", args.depth);
+    run(python, embedArgs, { cwd: ROOT_DIR });
+  }
+  if (!fs.existsSync(BUILT_LAYOUT)) {
+    fail(`missing built glyph layout: ${BUILT_LAYOUT}`);
+  }
   fs.copyFileSync(BUILT_TTF, TARGET_TTF);
+  fs.copyFileSync(BUILT_LAYOUT, TARGET_LAYOUT);
 
-  process.stdout.write(`${TARGET_TTF}\n`);
+  process.stdout.write(`${TARGET_TTF}\n${TARGET_LAYOUT}\n`);
 }
 
 main();
@@ -10,6 +10,7 @@ const TARGET_DIR = path.join(ROOT_DIR, "fonts");
 
 const SOURCE_TTF = path.join("fonts", "CellGaugeSymbols.ttf");
 const TARGET_TTF = "CellGaugeSymbols.ttf";
+const TARGET_LAYOUT = "CellGaugeSymbols.layout";
 
 function fail(message) {
   process.stderr.write(`sync-font: ${message}\n`);
@@ -83,6 +84,13 @@ function main() {
     fail(`missing source TTF; checked: ${sourceCandidates.join(", ")}`);
   }
 
+  // The renderer reads codepoints from the glyph layout built alongside the
+  // font, so the two must always be synced together.
+  const sourceLayoutPath = sourceTtfPath.replace(/\.ttf$/, ".layout");
+  if (!fs.existsSync(sourceLayoutPath)) {
+    fail(`missing glyph layout next to source TTF: ${sourceLayoutPath}`);
+  }
+
   fs.mkdirSync(TARGET_DIR, { recursive: true });
   const targetTtfPath = path.join(TARGET_DIR, TARGET_TTF);
   if (path.resolve(sourceTtfPath) === path.resolve(targetTtfPath)) {
@@ -90,6 +98,7 @@ function main() {
     return;
   }
   fs.copyFileSync(sourceTtfPath, targetTtfPath);
+  fs.copyFileSync(sourceLayoutPath, path.join(TARGET_DIR, TARGET_LAYOUT));
 
   process.stdout.write(`synced ${targetTtfPath}\n`);
 }
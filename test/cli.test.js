@@ -33,6 +33,26 @@ test("installs packaged font into explicit directory", () => {
   assert.equal(result.status, 0);
   const files = fs.readdirSync(installDir);
   assert.ok(files.some((name) => name.toLowerCase().endsWith(".ttf")));
+  assert.equal(result.stdout, `${path.join(installDir, files[0])}\n`);
+  assert.equal(result.stderr, "cellgauge: font installed\n");
+});
+
+test("install-font skips identical fonts and replaces changed ones", () => {
+  const installDir = fs.mkdtempSync(path.join(os.tmpdir(), "cellgauge-font-"));
+  const first = run(["install-font", "--font-dir", installDir]);
+  assert.equal(first.status, 0);
+  const installedPath = first.stdout.trim();
+
+  const again = run(["install-font", "--font-dir", installDir]);
+  assert.equal(again.stdout, `${installedPath}\n`);
+  assert.equal(again.stderr, "cellgauge: font up-to-date\n");
+
+  fs.writeFileSync(installedPath, "stale");
+  const updated = run(["install-font", "--font-dir", installDir]);
+  assert.equal(updated.stdout, `${installedPath}\n`);
+  assert.equal(updated.stderr, "cellgauge: font updated\n");
+  assert.deepEqual(fs.readFileSync(installedPath), fs.readFileSync(run(["font-path"]).stdout.trim()));
+  assert.deepEqual(fs.readdirSync(installDir), [path.basename(installedPath)]);
 });
 
 test("no-border bars use m variant for all cells (left-anchored fill)", () => {
@@ -134,3 +154,124 @@ test("bordered 2-lane keeps l when any lane is 0, redirects when all positive",
   const expectedM88 = nhbBase + VARIANTS.indexOf("m") * variantBlock + 8 * STRIDE + 8;
   assert.equal(redirGlyphs[0].codePointAt(0), expectedM88);
 });
+
+test("stream redraws a gauge fully once, then only its changed cells", () => {
+  const result = spawnSync(process.execPath, [CLI, "stream"], {
+    encoding: "utf8",
+    input: "cpu 2 5 0 --width 4 --border\ncpu 2 5 0 --width 4 --border\ncpu 2 5 50 --width 4 --border\n",
+  });
+  assert.equal(result.status, 0);
+
+  const full = Array.from(run(["0", "--width", "4", "--border"]).stdout.trimEnd());
+  const half = Array.from(run(["50", "--width", "4", "--border"]).stdout.trimEnd());
+  const first = `\x1b[2;5H${full.join("")}`;
+  assert.ok(result.stdout.startsWith(first));
+
+  // The repeated line writes nothing; 50% changes only the first two cells.
+  assert.equal(result.stdout.slice(first.length), `\x1b[2;5H${half.slice(0, 2).join("")}`);
+  assert.deepEqual(half.slice(2), full.slice(2));
+});
+
+test("stream does a full redraw when the width changes", () => {
+  const result = spawnSync(process.execPath, [CLI, "stream"], {
+    encoding: "utf8",
+    input: "mem 1 1 30 --width 4\nmem 1 1 30 --width 3\n",
+  });
+  assert.equal(result.status, 0);
+  const narrow = run(["30", "--width", "3"]).stdout.replace(/\n$/, "");
+  assert.ok(result.stdout.endsWith(`\x1b[1;1H${narrow} `));
+});
+
+test("stream erases a gauge's old position when it moves", () => {
+  const result = spawnSync(process.execPath, [CLI, "stream"], {
+    encoding: "utf8",
+    input: "a 1 1 50\na 2 1 50\n",
+  });
+  assert.equal(result.status, 0);
+  const bar = run(["50"]).stdout.replace(/\n$/, "");
+  assert.equal(result.stdout, `\x1b[1;1H${bar}\x1b[1;1H${" ".repeat(8)}\x1b[2;1H${bar}`);
+});
+
+test("stream rejects whole-line options on gauge lines", () => {
+  const result = spawnSync(process.execPath, [CLI, "stream"], {
+    encoding: "utf8",
+    input: "b 1 1 --format {bar:4:nhb:50}\nb 1 1 50 --seam-space\nb 1 1 --help\n",
+  });
+  assert.equal(result.status, 0);
+  assert.equal(result.stdout, "");
+  assert.deepEqual(result.stderr.trimEnd().split("\n"), [
+    "cellgauge: --format is not supported on stream lines",
+    "cellgauge: --seam-space is not supported on stream lines",
+    "cellgauge: --help is not supported on stream lines",
+  ]);
+});
+
+test("wide bars are uniform runs around the partial cell", () => {
+  const result = run(["50.2", "--width", "240", "--border"]);
+  assert.equal(result.status, 0);
+  const cps = Array.from(result.stdout.replace(/\n$/, "")).map((g) => g.codePointAt(0));
+  assert.equal(cps.length, 240);
+
+  // 50.2% of 240 cells * 8 levels = 963.84 -> 964 units: 120 full cells,
+  // then one cell at level 4, then empty cells up to the right cap.
+  const BAR1_BASE = 0x10fa20;
+  const BAR1_STRIDE = 9;
+  const nhbBase = BAR1_BASE + 2 * BAR1_STRIDE * 4;
+  const m = (level) => nhbBase + 1 * BAR1_STRIDE + level;
+  assert.equal(cps[0], m(8)); // l redirected to m: cap hidden by fill
+  assert.ok(cps.slice(1, 120).every((cp) => cp === m(8)));
+  assert.equal(cps[120], m(4));
+  assert.ok(cps.slice(121, 239).every((cp) => cp === m(0)));
+  assert.equal(cps[239], nhbBase + 2 * BAR1_STRIDE + 0);
+});
+
+test("format renders every gauge of a template in one invocation", () => {
+  const result = run([
+    "--format",
+    "cpu {bar:10:nhb:$1} mem {bar2:8:ghb:$2,$3} net {bar3:6:gfn:$2,50,$1} bat {donut:fb:$4} {{ok}}",
+    "42", "60", "10", "80",
+  ]);
+  assert.equal(result.status, 0);
+
+  const one = (args) => run(args).stdout.replace(/\n$/, "");
+  const expected = [
+    "cpu ", one(["42", "--width", "10", "--border"]),
+    " mem ", one(["60", "10", "--width", "8", "--gapped", "--border"]),
+    " net ", one(["60", "50", "42", "--width", "6", "--gapped", "--full"]),
+    " bat ", one(["80", "--donut", "--full", "--border"]),
+    " {ok}",
+  ].join("");
+  assert.equal(result.stdout, `${expected}\n`);
+});
+
+test("format treats single-lane gapped styles like the CLI does", () => {
+  const templated = run(["--format", "{bar:5:ghb:$1}", "33"]);
+  const direct = run(["33", "--width", "5", "--gapped", "--border"]);
+  assert.equal(templated.status, 0);
+  assert.equal(templated.stdout, direct.stdout);
+});
+
+test("format rejects every option its placeholders override", () => {
+  for (const option of [["--donut"], ["--gapped"], ["--full"], ["--border"], ["--no-border"], ["--width", "20"]]) {
+    const result = run(["--format", "{bar:4:nhb:$1}", "50", ...option]);
+    assert.equal(result.status, 2, option[0]);
+    assert.equal(result.stdout, "");
+    assert.match(result.stderr, new RegExp(`set their own kind, style and width: ${option[0]}\\n`));
+  }
+  const joined = run(["--format", "{bar:4:nhb:$1}", "50", "--width=20", "--full"]);
+  assert.match(joined.stderr, /width: --width, --full\n/);
+});
+
+test("format rejects bad placeholders and missing values", () => {
+  const missing = run(["--format", "{bar:4:nhb:$2}", "10"]);
+  assert.equal(missing.status, 2);
+  assert.match(missing.stderr, /references \$2 but only 1 value/);
+
+  const style = run(["--format", "{donut:nhb:$1}", "10"]);
+  assert.equal(style.status, 2);
+  assert.match(style.stderr, /unknown donut style/);
+
+  const width = run(["--format", "{bar:0:nhb:$1}", "10"]);
+  assert.equal(width.status, 2);
+  assert.match(width.stderr, /width must be a positive integer/);
+});
@@ -0,0 +1,162 @@
+const test = require("node:test");
+const assert = require("node:assert/strict");
+const fs = require("node:fs");
+const os = require("node:os");
+const path = require("node:path");
+const { spawnSync } = require("node:child_process");
+
+const cellgauge = require("..");
+
+const FEED_DIR = path.resolve(__dirname, "..", "scripts", "feed");
+const PYTHON = process.env.CELLGAUGE_PYTHON || "python3";
+const HAS_PYTHON = spawnSync(PYTHON, ["-c", "import sys; sys.exit(sys.version_info < (3, 8))"]).status === 0;
+
+// Runs `script` with cellgauge_feed importable as `feed`; JSON in, JSON out.
+function feedPython(script, input, args = []) {
+  const prelude = "import json, sys\nsys.path.insert(0, sys.argv[1])\nimport cellgauge_feed as feed\n";
+  const result = spawnSync(PYTHON, ["-c", prelude + script, FEED_DIR, ...args], {
+    input: JSON.stringify(input),
+    encoding: "utf8",
+  });
+  assert.equal(result.status, 0, result.stderr);
+  return JSON.parse(result.stdout);
+}
+
+test("feeder renderers match lib/render.js", { skip: !HAS_PYTHON && "python3 not available" }, () => {
+  const { families } = cellgauge.packagedLayout();
+  const pcts = [0, 0.4, 6.25, 12.5, 33.3, 50, 62.5, 87.5, 99.9, 100, -3, 140];
+  const bars = [];
+  for (const lanes of [1, 2, 3]) {
+    for (const style of families[`bar${lanes}`].styles) {
+      for (const width of [1, 2, 3, 5, 8, 13]) {
+        pcts.forEach((_, i) => {
+          const values = [pcts[i], pcts[(i + 5) % pcts.length], pcts[(i + 7) % pcts.length]].slice(0, lanes);
+          bars.push([lanes, width, style, values]);
+        });
+      }
+    }
+  }
+  const donuts = [];
+  for (const style of families.donut2.styles) {
+    for (const pct of pcts) donuts.push([style, pct]);
+  }
+
+  const rendered = feedPython(
+    `
+cases = json.load(sys.stdin)
+families = feed.load_layout(feed.DEFAULT_LAYOUT)
+bars = [feed.BarRenderer(families, lanes, width, style).render(values) for lanes, width, style, values in cases["bars"]]
+donuts = [feed.DonutRenderer(families, style).render([pct]) for style, pct in cases["donuts"]]
+json.dump({"bars": bars, "donuts": donuts}, sys.stdout)
+`,
+    { bars, donuts },
+  );
+  assert.deepEqual(
+    rendered.bars,
+    bars.map(([, width, style, values]) => cellgauge.renderBar(values, width, style)),
+  );
+  assert.deepEqual(
+    rendered.donuts,
+    donuts.map(([style, pct]) => cellgauge.renderDonut(pct, style)),
+  );
+});
+
+function writeProc(root, { stat, mem, rx, tx }) {
+  fs.mkdirSync(path.join(root, "net"), { recursive: true });
+  fs.writeFileSync(path.join(root, "stat"), `cpu  ${stat.join(" ")} 0 0\ncpu0 ${stat.join(" ")} 0 0\n`);
+  fs.writeFileSync(path.join(root, "meminfo"), `MemTotal:       ${mem[0]} kB\nMemAvailable:   ${mem[1]} kB\n`);
+  fs.writeFileSync(
+    path.join(root, "net", "dev"),
+    "Inter-|   Receive |  Transmit\n face |bytes packets|bytes packets\n" +
+      `  eth0: ${rx} 0 0 0 0 0 0 0 ${tx} 0 0 0 0 0 0 0\n`,
+  );
+}
+
+test("feeder gauges sample a /proc tree and report changes", { skip: !HAS_PYTHON && "python3 not available" }, () => {
+  const tmp = fs.mkdtempSync(path.join(os.tmpdir(), "cellgauge-proc-"));
+  const first = path.join(tmp, "1");
+  const second = path.join(tmp, "2");
+  // cpu: 200 of 1000 ticks busy since boot, then 200 of the next 500.
+  // mem: 75% used both times.  net: 1000 B/s max, sampled 2s apart.
+  writeProc(first, { stat: [100, 0, 100, 700, 100, 0, 0, 0], mem: [1000, 250], rx: 1000, tx: 5000 });
+  writeProc(second, { stat: [250, 0, 150, 1000, 100, 0, 0, 0], mem: [1000, 250], rx: 2000, tx: 6500 });
+
+  const ticks = feedPython(
+    `
+config = json.load(sys.stdin)
+families = feed.load_layout(feed.DEFAULT_LAYOUT)
+gauges = [feed.parse_gauge(raw, i, families, 1.0) for i, raw in enumerate(config)]
+ticks = []
+for root, now in ((sys.argv[2], 10.0), (sys.argv[3], 12.0)):
+    snap = feed.ProcSnapshot(root=root)
+    changed = [g.update(snap, now) for g in gauges]
+    ticks.append({"changed": changed, "texts": [g.text for g in gauges]})
+json.dump(ticks, sys.stdout)
+`,
+    [
+      { id: "cpu", metrics: ["cpu"], width: 8, border: true },
+      { id: "mem", kind: "donut", metrics: ["mem"], full: true, border: true },
+      {
+        id: "net",
+        metrics: [
+          { source: "net:eth0:rx", max: 1000 },
+          { source: "net:eth0:tx", max: 1000 },
+        ],
+        width: 6,
+        gapped: true,
+        border: true,
+      },
+    ],
+    [first, second],
+  );
+
+  assert.deepEqual(ticks[0], {
+    changed: [true, true, false],
+    texts: [cellgauge.renderBar([20], 8, "nhb"), cellgauge.renderDonut(75, "fb"), cellgauge.renderBar([0, 0], 6, "ghb")],
+  });
+  assert.deepEqual(ticks[1], {
+    changed: [true, false, true],
+    texts: [cellgauge.renderBar([40], 8, "nhb"), cellgauge.renderDonut(75, "fb"), cellgauge.renderBar([50, 75], 6, "ghb")],
+  });
+});
+
+test("feeder delivers the newest line once a lagging FIFO reader drains", { skip: !HAS_PYTHON && "python3 not available" }, () => {
+  const fifo = path.join(fs.mkdtempSync(path.join(os.tmpdir(), "cellgauge-fifo-")), "feed");
+  const result = feedPython(
+    `
+import os
+path = sys.argv[2]
+os.mkfifo(path)
+reader = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+writer = feed.LineWriter(path)
+families = feed.load_layout(feed.DEFAULT_LAYOUT)
+gauge = feed.parse_gauge({"id": "cpu", "metrics": ["cpu"], "width": 4}, 0, families, 1.0)
+line_feed = feed.Feed([gauge], None, " ", writer)
+writer.write("x")  # opens the FIFO
+filler = 0
+for chunk in (b"x" * 4096, b"x"):
+    while True:
+        try:
+            filler += os.write(writer.fd, chunk)
+        except BlockingIOError:
+            break
+line_feed.emit()  # the pipe is full, so this line has to wait
+blocked = writer.pending is not None
+while True:
+    try:
+        if not os.read(reader, 65536):
+            break
+    except BlockingIOError:
+        break
+line_feed.emit()  # same line as before: only retries the pending one
+delivered = os.read(reader, 65536).decode("utf-8")
+json.dump({"filler": filler, "blocked": blocked, "delivered": delivered, "pending": writer.pending}, sys.stdout)
+`,
+    null,
+    [fifo],
+  );
+  assert.ok(result.filler > 0);
+  assert.equal(result.blocked, true);
+  assert.equal(result.delivered, `${cellgauge.renderBar([0], 4, "nhn")}\n`);
+  assert.equal(result.pending, null);
+});
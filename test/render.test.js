@@ -0,0 +1,110 @@
+const test = require("node:test");
+const assert = require("node:assert/strict");
+const fs = require("node:fs");
+const os = require("node:os");
+const path = require("node:path");
+const { spawnSync } = require("node:child_process");
+
+const cellgauge = require("..");
+const { PACKAGED_LAYOUT_PATH } = require("../lib/layout");
+
+const CLI = path.resolve(__dirname, "..", "bin", "cellgauge.js");
+
+function cli(args) {
+  return spawnSync(process.execPath, [CLI, ...args], { encoding: "utf8" }).stdout.replace(/\n$/, "");
+}
+
+test("requiring the package has no side effects on stdout", () => {
+  const result = spawnSync(process.execPath, ["-e", "require(process.argv[1])", path.resolve(__dirname, "..")], {
+    encoding: "utf8",
+  });
+  assert.equal(result.status, 0);
+  assert.equal(result.stdout, "");
+  assert.equal(result.stderr, "");
+});
+
+test("createRenderer output matches the CLI for every chart kind", () => {
+  const cases = [
+    [{ width: 10, border: true }, [42], ["42", "--width", "10", "--border"]],
+    [{ lanes: 2, gapped: true, border: true, width: 6 }, [20, 65], ["20", "65", "--gapped", "--border", "--width", "6"]],
+    [{ lanes: 3, gapped: true, full: true }, [73, 39, 55], ["73", "39", "55", "--gapped", "--full"]],
+    [{ kind: "donut", full: true, border: true }, 45, ["45", "--donut", "--full", "--border"]],
+  ];
+  for (const [options, values, args] of cases) {
+    assert.equal(cellgauge.createRenderer(options).render(values), cli(args));
+  }
+});
+
+test("renderers are reusable and expose their resolved configuration", () => {
+  const renderer = cellgauge.createRenderer({ width: 4, gapped: true, border: true });
+  // Single-lane bars drop the gap, exactly like the CLI.
+  assert.equal(renderer.style, "nhb");
+  assert.equal(renderer.width, 4);
+  assert.equal(renderer.render(25), cellgauge.renderBar([25], 4, "nhb"));
+  assert.equal(renderer.render([75]), cellgauge.renderBar([75], 4, "nhb"));
+  assert.ok(Object.isFrozen(renderer));
+
+  const donut = cellgauge.createRenderer({ kind: "donut" });
+  assert.equal(donut.render(0), "  ");
+  assert.equal(donut.render([50]), cellgauge.renderDonut(50, cellgauge.buildDonutStyle(false, false)));
+});
+
+test("createRenderer rejects invalid options up front", () => {
+  assert.throws(() => cellgauge.createRenderer({ width: 0 }), /width must be a positive integer/);
+  assert.throws(() => cellgauge.createRenderer({ width: 2.5 }), /width must be a positive integer/);
+  assert.throws(() => cellgauge.createRenderer({ lanes: 4 }), /lanes must be 1, 2 or 3/);
+  assert.throws(() => cellgauge.createRenderer({ kind: "pie" }), /unknown renderer kind: pie/);
+});
+
+test("glyph layout redirects deduplicated states to glyphs the font has", () => {
+  const { families } = cellgauge.packagedLayout();
+  const bar1 = families.bar1;
+  const nhb = bar1.styles.indexOf("nhb") * bar1.styleBlock;
+  const variant = (v) => nhb + bar1.variants.indexOf(v) * bar1.states;
+  // A full left cap hides its border, so it shares the middle glyph.
+  assert.equal(bar1.codepoints[variant("l") + 8], bar1.codepoints[variant("m") + 8]);
+  assert.notEqual(bar1.codepoints[variant("l") + 0], bar1.codepoints[variant("m") + 0]);
+  // Empty no-border cells are spaces.
+  assert.equal(bar1.codepoints[bar1.styles.indexOf("nhn") * bar1.styleBlock + bar1.states], 0);
+
+  assert.throws(() => cellgauge.parseLayout(Buffer.from("nope")), /not a cellgauge glyph layout/);
+  assert.throws(
+    () => cellgauge.createRenderer({ lanes: 2, layout: { families: {} } }),
+    /glyph layout has no bar2 family/,
+  );
+});
+
+test("a family with no glyphs in the font is rejected, not rendered blank", () => {
+  const buf = fs.readFileSync(PACKAGED_LAYOUT_PATH);
+  // Clear the presence bitmap of the donut2 family record.
+  for (let i = 0; i < buf.readUInt16LE(6); i += 1) {
+    const record = 8 + i * 44;
+    if (buf.toString("ascii", record, record + 8).replace(/\0+$/, "") !== "donut2") continue;
+    const bitmap = buf.readUInt32LE(record + 24);
+    buf.fill(0, bitmap, bitmap + Math.ceil(buf.readUInt32LE(record + 20) / 8));
+  }
+  const layout = cellgauge.parseLayout(buf);
+  assert.equal(layout.families.donut2.glyphs, 0);
+  assert.ok(layout.families.bar1.glyphs > 0);
+  assert.throws(() => cellgauge.createRenderer({ kind: "donut", layout }), /no donut2 glyphs; rebuild the font/);
+  assert.match(cellgauge.createRenderer({ layout }).render(50), /[^ ]/);
+});
+
+test("templates parse once and render against fresh values", () => {
+  const parts = cellgauge.parseTemplate("cpu {bar:4:nhb:$1} bat {donut:fb:$2}");
+  const first = cellgauge.renderTemplate(parts, [10, 20]);
+  const second = cellgauge.renderTemplate(parts, [90, 80]);
+  assert.equal(first, cli(["--format", "cpu {bar:4:nhb:$1} bat {donut:fb:$2}", "10", "20"]));
+  assert.equal(second, cli(["--format", "cpu {bar:4:nhb:$1} bat {donut:fb:$2}", "90", "80"]));
+});
+
+test("fontPath points at the packaged font", () => {
+  assert.equal(cellgauge.fontPath, cli(["font-path"]));
+});
+
+test("installFont reports the installed path and what it did", () => {
+  const fontDir = fs.mkdtempSync(path.join(os.tmpdir(), "cellgauge-font-"));
+  const fontFile = path.join(fontDir, path.basename(cellgauge.fontPath));
+  assert.deepEqual(cellgauge.installFont(fontDir), { path: fontFile, status: "installed" });
+  assert.deepEqual(cellgauge.installFont(fontDir), { path: fontFile, status: "up-to-date" });
+});